@@ -6,7 +6,6 @@ Shared utilities for COLMAP reconstruction processing
 import pycolmap
 import numpy as np
 from pathlib import Path
-from sklearn.decomposition import PCA
 from sklearn.cluster import KMeans
 from sklearn.linear_model import RANSACRegressor
 
@@ -26,27 +25,30 @@ def export_full_point_cloud(recon, R, output_file, downsample=10):
     Export the full 3D point cloud with gravity correction applied.
     downsample: Keep 1 in N points (e.g., 10 = keep 10% of points)
     """
-    # First pass: count points to export
-    point_count = (recon.num_points3D() + downsample - 1) // downsample
-    
+    # Gather every Nth point, then rotate all of them in one batched matmul.
+    # Right-multiplying by R.T keeps the (N, 3) rows contiguous for BLAS.
+    points = list(recon.points3D.values())[::downsample]
+    if not points:
+        # An empty stack would come out (0,) rather than (0, 3) and break
+        # the matmul; just write the zero-count header like the old loop did
+        with open(output_file, 'w') as f:
+            f.write("0\n")
+        print(f"Exported 0 3D points (downsampled from {recon.num_points3D()}) to {output_file}")
+        return
+
+    xyz = np.array([point.xyz for point in points])
+    colors = np.array([point.color for point in points], dtype=np.int64)
+
+    RT = np.ascontiguousarray(R.T)
+    oriented = xyz @ RT
+    intensities = colors.sum(axis=1) // 3
+
     with open(output_file, 'w') as f:
-        f.write(f"{point_count}\n")
-        
-        # Export points with gravity correction
-        point_idx = 0
-        exported = 0
-        for point_id, point in recon.points3D.items():
-            if point_idx % downsample == 0:
-                # Apply gravity correction rotation
-                oriented_pos = R @ point.xyz
-                x, y, z = oriented_pos[0], oriented_pos[1], oriented_pos[2]
-                r, g, b = point.color[0], point.color[1], point.color[2]
-                intensity = int((int(r) + int(g) + int(b)) / 3.0)
-                f.write(f"{x:.6f} {y:.6f} {z:.6f} {r} {g} {b} {intensity}\n")
-                exported += 1
-            point_idx += 1
-    
-    print(f"Exported {exported} 3D points (downsampled from {recon.num_points3D()}) to {output_file}")
+        f.write(f"{len(points)}\n")
+        for (x, y, z), (r, g, b), intensity in zip(oriented, colors, intensities):
+            f.write(f"{x:.6f} {y:.6f} {z:.6f} {r} {g} {b} {intensity}\n")
+
+    print(f"Exported {len(points)} 3D points (downsampled from {recon.num_points3D()}) to {output_file}")
 
 def estimate_gravity_from_cameras(camera_positions):
     """
@@ -79,14 +81,10 @@ def estimate_gravity_from_cameras(camera_positions):
     
     # Compute covariance matrix
     cov_matrix = np.cov(centered.T)
-    
-    # Get eigenvalues and eigenvectors
-    eigenvalues, eigenvectors = np.linalg.eig(cov_matrix)
-    
-    # Sort by eigenvalue (smallest to largest)
-    idx = eigenvalues.argsort()
-    eigenvalues = eigenvalues[idx]
-    eigenvectors = eigenvectors[:, idx]
+
+    # Get eigenvalues and eigenvectors; the covariance is symmetric, so eigh
+    # returns them real and already sorted smallest to largest
+    eigenvalues, eigenvectors = np.linalg.eigh(cov_matrix)
     
     print(f"  PCA on main cluster - eigenvalues:")
     print(f"    Smallest (up direction): {eigenvalues[0]:.6f}")
@@ -112,24 +110,27 @@ def compute_gravity_alignment_rotation(gravity_direction, target_up=np.array([0,
     """Compute rotation matrix to align estimated gravity with target up direction."""
     gravity_direction = gravity_direction / np.linalg.norm(gravity_direction)
     target_up = target_up / np.linalg.norm(target_up)
-    
-    axis = np.cross(gravity_direction, target_up)
-    axis_length = np.linalg.norm(axis)
-    
-    if axis_length < 1e-10:
-        return np.eye(3)
-    
-    axis = axis / axis_length
-    dot_product = np.clip(np.dot(gravity_direction, target_up), -1.0, 1.0)
-    angle = np.arccos(dot_product)
-    
+
+    # Trig-free Rodrigues: R = I + K + K^2 / (1 + cos) with K^2 expanded to
+    # outer products, avoiding arccos/sin round trips and the K @ K matmul.
+    w = np.cross(gravity_direction, target_up)
+    cos_angle = np.dot(gravity_direction, target_up)
+
+    if 1.0 + cos_angle < 1e-10:
+        # Antiparallel: rotate 180 degrees about any axis perpendicular to gravity
+        perp = np.cross(gravity_direction, np.array([1.0, 0.0, 0.0]))
+        if np.linalg.norm(perp) < 1e-10:
+            perp = np.cross(gravity_direction, np.array([0.0, 1.0, 0.0]))
+        perp = perp / np.linalg.norm(perp)
+        return 2.0 * np.outer(perp, perp) - np.eye(3)
+
     K = np.array([
-        [0, -axis[2], axis[1]],
-        [axis[2], 0, -axis[0]],
-        [-axis[1], axis[0], 0]
+        [0, -w[2], w[1]],
+        [w[2], 0, -w[0]],
+        [-w[1], w[0], 0]
     ])
-    
-    R = np.eye(3) + np.sin(angle) * K + (1 - np.cos(angle)) * np.dot(K, K)
+
+    R = np.eye(3) + K + (np.outer(w, w) - np.dot(w, w) * np.eye(3)) / (1.0 + cos_angle)
     return R
 
 def generate_svg(camera_data, output_file):
@@ -316,12 +317,9 @@ def process_camera_data(camera_data, debug_output=True):
     # Find optimal X-axis rotation to align building floors horizontally
     print(f"  Finding optimal X-axis rotation to align building floors horizontally...")
     
-    # First apply gravity alignment
-    temp_positions = []
-    for cam_data in camera_data:
-        temp_pos = R @ cam_data['position_3d']
-        temp_positions.append(temp_pos)
-    temp_positions = np.array(temp_positions)
+    # First apply gravity alignment (batched: rows @ R.T instead of per-point R @ x)
+    positions = np.array([cam_data['position_3d'] for cam_data in camera_data])
+    temp_positions = positions @ np.ascontiguousarray(R.T)
     
     # Find optimal X-axis rotation
     best_angle_x, best_variance = find_optimal_x_rotation(temp_positions, labels)
@@ -353,9 +351,9 @@ def process_camera_data(camera_data, debug_output=True):
         print(f"    Test camera after second pass:  ({after_second[0]:.3f}, {after_second[1]:.3f}, {after_second[2]:.3f})")
         print(f"    Z difference: {after_second[2] - before_second[2]:.6f}")
     
-    # Apply combined rotation to all camera positions
-    for i, cam_data in enumerate(camera_data):
-        oriented_pos = R_combined @ cam_data['position_3d']
+    # Apply combined rotation to all camera positions in one batched matmul
+    oriented_positions = positions @ np.ascontiguousarray(R_combined.T)
+    for i, oriented_pos in enumerate(oriented_positions):
         camera_data[i]['position_3d_oriented'] = oriented_pos
-    
+
     return R_combined, camera_data
@@ -5,130 +5,32 @@ Based on auto_gravity_align.py but modified to handle multiple folders.
 """
 
 import argparse
+import functools
+import multiprocessing
+import os
+import re
 import numpy as np
 import pycolmap
 from pathlib import Path
 from datetime import datetime
-from sklearn.decomposition import PCA
+from gravity_align_utils import (
+    export_point_cloud,
+    estimate_gravity_from_cameras,
+    compute_gravity_alignment_rotation,
+)
 
-def export_point_cloud(camera_data, output_file):
-    """
-    Export camera positions as point cloud in PTS format.
-    PTS format: X Y Z R G B Intensity
-    """
-    with open(output_file, 'w') as f:
-        # Write header with point count
-        f.write(f"{len(camera_data)}\n")
-        
-        # Write each camera position as a point
-        for cam_data in camera_data:
-            # Get oriented 3D position
-            pos = cam_data['position_3d_oriented']
-            x, y, z = pos[0], pos[1], pos[2]
-            
-            # Use red color for all camera positions
-            r, g, b = 255, 0, 0
-            intensity = 255  # Full intensity for camera positions
-            
-            # PTS format: X Y Z R G B Intensity
-            f.write(f"{x:.6f} {y:.6f} {z:.6f} {r} {g} {b} {intensity}\n")
-    
-    print(f"Exported {len(camera_data)} camera positions to {output_file}")
+# Timestamp embedded in image names, e.g. 2025-10-17_02-21-47
+TIMESTAMP_RE = re.compile(r'(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})')
 
-def estimate_gravity_from_cameras(camera_positions):
-    """
-    Estimate gravity direction from camera positions using PCA.
-    Assumes cameras lie approximately on a plane (constant height).
-    
-    Args:
-        camera_positions: Nx3 array of camera positions
-        
-    Returns:
-        gravity_direction: normalized 3D vector pointing "up"
-    """
-    print(f"Analyzing {len(camera_positions)} camera positions for gravity detection...")
-    
-    # Center the camera positions
-    mean_pos = np.mean(camera_positions, axis=0)
-    centered = camera_positions - mean_pos
-    
-    print(f"Mean camera position: ({mean_pos[0]:.3f}, {mean_pos[1]:.3f}, {mean_pos[2]:.3f})")
-    
-    # Apply PCA
-    pca = PCA(n_components=3)
-    pca.fit(centered)
-    
-    # Print variance explained by each component
-    print(f"PCA variance explained:")
-    print(f"  Component 1: {pca.explained_variance_[0]:.6f} (main movement direction)")
-    print(f"  Component 2: {pca.explained_variance_[1]:.6f} (secondary movement)")
-    print(f"  Component 3: {pca.explained_variance_[2]:.6f} (height variation - should be smallest)")
-    
-    # The component with smallest variance is perpendicular to the plane
-    # This is the gravity direction (up vector)
-    gravity_direction = pca.components_[2]  # Last component = smallest variance
-    
-    print(f"Estimated gravity direction (raw): ({gravity_direction[0]:.6f}, {gravity_direction[1]:.6f}, {gravity_direction[2]:.6f})")
-    
-    # Make sure it points "up" (positive in the vertical direction)
-    # Check if we need to flip it - choose direction with positive Z component
-    if gravity_direction[2] < 0:
-        gravity_direction = -gravity_direction
-        print("Flipped gravity direction to point upward")
-    
-    print(f"Final gravity direction (up): ({gravity_direction[0]:.6f}, {gravity_direction[1]:.6f}, {gravity_direction[2]:.6f})")
-    
-    return gravity_direction, mean_pos
+# SVG element templates, hoisted so the per-camera loop only fills in values
+# (coordinates arrive pre-formatted via np.char.mod)
+SVG_CIRCLE_TEMPLATE = ('  <circle cx="{x}" cy="{y}" {attrs}\n'
+                       '    <title>{tooltip}</title>\n'
+                       '  </circle>')
+SVG_CIRCLE_ATTRS_TEMPLATE = ('r="{radius:.4f}" \n'
+                             '          fill="red" stroke="darkred" stroke-width="{stroke:.4f}" \n'
+                             '          opacity="0.8">')
 
-def compute_gravity_alignment_rotation(gravity_direction, target_up=np.array([0, 0, 1])):
-    """
-    Compute rotation matrix to align estimated gravity with target up direction (Z-up).
-    Uses Rodrigues' rotation formula.
-    
-    Args:
-        gravity_direction: Current up direction (normalized)
-        target_up: Desired up direction (default: [0, 0, 1] for Z-up)
-        
-    Returns:
-        R: 3x3 rotation matrix
-    """
-    # Normalize both vectors
-    gravity_direction = gravity_direction / np.linalg.norm(gravity_direction)
-    target_up = target_up / np.linalg.norm(target_up)
-    
-    print(f"Computing rotation to align:")
-    print(f"  From: ({gravity_direction[0]:.6f}, {gravity_direction[1]:.6f}, {gravity_direction[2]:.6f})")
-    print(f"  To:   ({target_up[0]:.6f}, {target_up[1]:.6f}, {target_up[2]:.6f})")
-    
-    # Rotation axis (cross product)
-    axis = np.cross(gravity_direction, target_up)
-    axis_length = np.linalg.norm(axis)
-    
-    # Handle special case: vectors already aligned
-    if axis_length < 1e-10:
-        print("Gravity already aligned with Z-up! Using identity rotation.")
-        return np.eye(3)
-    
-    axis = axis / axis_length
-    
-    # Rotation angle (dot product)
-    dot_product = np.clip(np.dot(gravity_direction, target_up), -1.0, 1.0)
-    angle = np.arccos(dot_product)
-    angle_degrees = np.degrees(angle)
-    
-    print(f"  Rotation axis: ({axis[0]:.6f}, {axis[1]:.6f}, {axis[2]:.6f})")
-    print(f"  Rotation angle: {angle_degrees:.2f} degrees")
-    
-    # Rodrigues' rotation formula
-    K = np.array([
-        [0, -axis[2], axis[1]],
-        [axis[2], 0, -axis[0]],
-        [-axis[1], axis[0], 0]
-    ])
-    
-    R = np.eye(3) + np.sin(angle) * K + (1 - np.cos(angle)) * K @ K
-    
-    return R
 
 def extract_camera_positions(reconstruction, camera_index=1):
     """
@@ -142,96 +44,111 @@ def extract_camera_positions(reconstruction, camera_index=1):
         camera_data: List of camera data dictionaries with positions and metadata
     """
     camera_data = []
-    
-    # Group images by frame_id
-    frame_cameras = {}
-    for image_id, image in reconstruction.images.items():
-        if hasattr(image, 'frame_id') and image.frame_id is not None:
-            if image.frame_id not in frame_cameras:
-                frame_cameras[image.frame_id] = []
-            frame_cameras[image.frame_id].append(image)
-    
-    # For each frame, find the specific camera
-    for frame_id in sorted(frame_cameras.keys()):
-        images_in_frame = frame_cameras[frame_id]
-        
-        for image in images_in_frame:
-            # Check if this is the camera we want
-            if f"camera{camera_index}" in image.name.lower():
-                # Get camera position
-                cam_from_world = image.cam_from_world()
-                rot_mat = cam_from_world.rotation.matrix()
-                cam_pos = -rot_mat.T @ cam_from_world.translation
-                
-                # Extract additional metadata
-                camera_info = {
-                    'position_3d': cam_pos,
-                    'image_name': image.name,
-                    'frame_id': frame_id,
-                    'image_id': image_id,
-                    'camera_id': image.camera_id,
-                    'rotation_matrix': rot_mat,
-                    'translation': cam_from_world.translation,
-                    'quaternion': cam_from_world.rotation.quat,
-                    'height': cam_pos[2]
-                }
-                
-                # Try to extract timestamp from image name
-                import re
-                timestamp_match = re.search(r'(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})', image.name)
-                if timestamp_match:
-                    camera_info['timestamp'] = timestamp_match.group(1)
-                
-                camera_data.append(camera_info)
-                break
-    
+
+    # Single pass over the images: keep the first matching camera per frame
+    # without building the intermediate frame_id -> [images] dict
+    camera_tag = f"camera{camera_index}"
+    match_per_frame = {}
+    for image in reconstruction.images.values():
+        frame_id = getattr(image, 'frame_id', None)
+        if frame_id is None or frame_id in match_per_frame:
+            continue
+        if camera_tag in image.name.lower():
+            match_per_frame[frame_id] = image
+
+    selected = [(frame_id, match_per_frame[frame_id])
+                for frame_id in sorted(match_per_frame.keys())]
+
+    if not selected:
+        return camera_data
+
+    # Pull each pose across the pybind boundary once, then batch the math:
+    # one einsum computes every camera center (-R^T t) instead of a
+    # per-image 3x3 matvec in Python
+    poses = [image.cam_from_world() for _, image in selected]
+    rotations = [pose.rotation for pose in poses]
+    rot_mats = np.array([rotation.matrix() for rotation in rotations])
+    quats = np.array([rotation.quat for rotation in rotations])
+    translations = np.array([pose.translation for pose in poses])
+    cam_positions = -np.einsum('nji,nj->ni', rot_mats, translations)
+
+    for (frame_id, image), rot_mat, translation, quat, cam_pos in zip(
+            selected, rot_mats, translations, quats, cam_positions):
+        # Extract additional metadata
+        camera_info = {
+            'position_3d': cam_pos,
+            'image_name': image.name,
+            'frame_id': frame_id,
+            'image_id': image.image_id,
+            'camera_id': image.camera_id,
+            'rotation_matrix': rot_mat,
+            'translation': translation,
+            'quaternion': quat,
+            'height': cam_pos[2]
+        }
+
+        # Try to extract timestamp from image name
+        timestamp_match = TIMESTAMP_RE.search(camera_info['image_name'])
+        if timestamp_match:
+            camera_info['timestamp'] = timestamp_match.group(1)
+
+        camera_data.append(camera_info)
+
     return camera_data
 
-def create_top_down_svg(camera_data, R, origin_m, scale, output_file):
+def create_top_down_svg(camera_data, R, origin_m, scale, output_file, camera_positions=None):
     """
     Create an SVG file showing top-down view of camera positions.
     ViewBox is centered on the median camera position for easy alignment.
-    
+
     Args:
         camera_data: List of camera data dictionaries with positions and metadata
         R: 3x3 rotation matrix
         origin_m: origin in meters (for transformation)
         scale: scale factor
         output_file: path to save SVG file
+        camera_positions: optional Nx3 array of positions already extracted
+            from camera_data, to avoid rebuilding it here
     """
     print("\nGenerating top-down SVG view of camera positions...")
-    
-    # Extract positions from camera data
-    camera_positions = np.array([cam['position_3d'] for cam in camera_data])
-    
-    # Transform camera positions same way as DXF export
-    transformed_positions = []
-    for i, cam_pos in enumerate(camera_positions):
-        transformed_pos = origin_m + scale * (R @ cam_pos)
-        transformed_positions.append(transformed_pos)
-        
-        # Update the camera_data with oriented Z-coordinate for height
+
+    # Extract positions from camera data (unless the caller already has them)
+    if camera_positions is None:
+        camera_positions = np.array([cam['position_3d'] for cam in camera_data])
+    
+    # Transform camera positions same way as DXF export (one batched matmul
+    # instead of a per-camera R @ x loop). The Nx3 sweep runs in float32:
+    # the SVG/PTS output is truncated to 3-6 decimals anyway, and halving
+    # the bytes moved is what matters for large N. The 3x3 gravity math
+    # upstream stays float64.
+    positions32 = camera_positions.astype(np.float32, copy=False)
+    transformed_positions = (origin_m.astype(np.float32)
+                             + np.float32(scale) * (positions32 @ R.T.astype(np.float32)))
+
+    # Update the camera_data with oriented Z-coordinate for height
+    for i, transformed_pos in enumerate(transformed_positions):
         camera_data[i]['height'] = transformed_pos[2]
         camera_data[i]['position_3d_oriented'] = transformed_pos
     
-    transformed_positions = np.array(transformed_positions)
-    
     # Extract X and Y coordinates (top-down view)
     # Flip Y-axis to match SVG coordinate system (Y increases downward in SVG)
     x_coords = transformed_positions[:, 0]
     y_coords = -transformed_positions[:, 1]  # Flip Y to match SVG coordinates
-    
-    # Calculate average center (mean of all points)
-    avg_x = np.mean(x_coords)
-    avg_y = np.mean(y_coords)
-    
-    # Calculate robust bounds (10th to 90th percentile + padding)
-    x_sorted = np.sort(x_coords)
-    y_sorted = np.sort(y_coords)
-    p10_idx = int(len(x_sorted) * 0.1)
-    p90_idx = int(len(x_sorted) * 0.9)
-    x_p10, x_p90 = x_sorted[p10_idx], x_sorted[p90_idx]
-    y_p10, y_p90 = y_sorted[p10_idx], y_sorted[p90_idx]
+
+    # Calculate average center in one reduction over the position block
+    mean_pos = transformed_positions.mean(axis=0)
+    avg_x = mean_pos[0]
+    avg_y = -mean_pos[1]
+    
+    # Calculate robust bounds (10th to 90th percentile + padding).
+    # Only the two order statistics are needed, so partition instead of a
+    # full sort.
+    p10_idx = int(len(x_coords) * 0.1)
+    p90_idx = int(len(x_coords) * 0.9)
+    x_part = np.partition(x_coords, (p10_idx, p90_idx))
+    y_part = np.partition(y_coords, (p10_idx, p90_idx))
+    x_p10, x_p90 = x_part[p10_idx], x_part[p90_idx]
+    y_p10, y_p90 = y_part[p10_idx], y_part[p90_idx]
     
     padding_factor = 1.3  # 30% padding
     width = (x_p90 - x_p10) * padding_factor
@@ -249,68 +166,76 @@ def create_top_down_svg(camera_data, R, origin_m, scale, output_file):
     print(f"  Robust bounds: {width:.2f} x {height:.2f} meters")
     print(f"  ViewBox: x={viewbox_x:.2f}, y={viewbox_y:.2f}, w={width:.2f}, h={height:.2f}")
     
-    # Create SVG content with centered viewBox
-    svg_lines = []
-    svg_lines.append('<?xml version="1.0" encoding="UTF-8"?>')
-    svg_lines.append(f'<svg viewBox="{viewbox_x:.3f} {viewbox_y:.3f} {width:.3f} {height:.3f}" ')
-    svg_lines.append(f'     xmlns="http://www.w3.org/2000/svg">')
-    svg_lines.append('  <!-- Top-down view of camera positions -->')
-    svg_lines.append('  <!-- ViewBox is centered on median camera position -->')
-    svg_lines.append(f'  <rect x="{viewbox_x}" y="{viewbox_y}" width="{width}" height="{height}" fill="white" opacity="0"/>')
-    
     # Calculate circle radius in world units (scaled appropriately)
     circle_radius = width * 0.008  # ~0.8% of width
     stroke_width = circle_radius * 0.2
-    
-    # Draw camera positions as circles with enhanced metadata
-    for i, (x, y) in enumerate(zip(x_coords_shifted, y_coords_shifted)):
-        cam_data = camera_data[i]
-        
-        # Create rich tooltip with metadata
-        tooltip_parts = [
-            f"Camera {i+1}",
-            f"2D: ({x:.2f}, {y:.2f})",
-            f"3D: ({cam_data['position_3d_oriented'][0]:.2f}, {cam_data['position_3d_oriented'][1]:.2f}, {cam_data['position_3d_oriented'][2]:.2f})",
-            f"Image: {cam_data['image_name']}",
-            f"Frame: {cam_data['frame_id']}",
-            f"Height: {cam_data['position_3d_oriented'][2]:.2f}m"
-        ]
-        
-        # Add timestamp if available
-        if 'timestamp' in cam_data:
-            tooltip_parts.append(f"Time: {cam_data['timestamp']}")
-        
-        # Add camera ID
-        tooltip_parts.append(f"Cam ID: {cam_data['camera_id']}")
-        
-        tooltip_text = " | ".join(tooltip_parts)
-        
-        svg_lines.append(f'  <circle cx="{x:.3f}" cy="{y:.3f}" r="{circle_radius:.4f}" ')
-        svg_lines.append(f'          fill="red" stroke="darkred" stroke-width="{stroke_width:.4f}" ')
-        svg_lines.append(f'          opacity="0.8">')
-        svg_lines.append(f'    <title>{tooltip_text}</title>')
-        svg_lines.append(f'  </circle>')
-    
-    # Draw path connecting cameras
-    path_points = [f"{x:.3f},{y:.3f}" for x, y in zip(x_coords_shifted, y_coords_shifted)]
-    svg_lines.append(f'  <polyline points="{" ".join(path_points)}" ')
-    svg_lines.append(f'            fill="none" stroke="red" stroke-width="{stroke_width * 2:.4f}" ')
-    svg_lines.append(f'            opacity="0.4" />')
-    
-    # Add center marker for reference (now at origin 0,0)
-    marker_size = circle_radius * 3
-    svg_lines.append(f'  <line x1="{-marker_size}" y1="0" ')
-    svg_lines.append(f'        x2="{marker_size}" y2="0" ')
-    svg_lines.append(f'        stroke="blue" stroke-width="{stroke_width:.4f}" opacity="0.5" />')
-    svg_lines.append(f'  <line x1="0" y1="{-marker_size}" ')
-    svg_lines.append(f'        x2="0" y2="{marker_size}" ')
-    svg_lines.append(f'        stroke="blue" stroke-width="{stroke_width:.4f}" opacity="0.5" />')
-    
-    svg_lines.append('</svg>')
-    
-    # Write to file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(svg_lines))
+
+    # Stream the SVG straight into a large-buffered file handle instead of
+    # accumulating every line in a list and joining at the end; this keeps
+    # peak memory at one buffer regardless of camera count
+    with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        w = f.write
+        w('<?xml version="1.0" encoding="UTF-8"?>\n')
+        w(f'<svg viewBox="{viewbox_x:.3f} {viewbox_y:.3f} {width:.3f} {height:.3f}" \n')
+        w(f'     xmlns="http://www.w3.org/2000/svg">\n')
+        w('  <!-- Top-down view of camera positions -->\n')
+        w('  <!-- ViewBox is centered on median camera position -->\n')
+        w(f'  <rect x="{viewbox_x}" y="{viewbox_y}" width="{width}" height="{height}" fill="white" opacity="0"/>\n')
+
+        # Draw camera positions as circles with enhanced metadata.
+        # The shared attribute tail is formatted once; per-camera work is
+        # reduced to the coordinates and tooltip.
+        circle_attrs = SVG_CIRCLE_ATTRS_TEMPLATE.format(radius=circle_radius,
+                                                        stroke=stroke_width)
+
+        # Pre-format every coordinate in bulk; the loop below and the
+        # trajectory polyline both reuse these strings
+        x_strs = np.char.mod('%.3f', x_coords_shifted)
+        y_strs = np.char.mod('%.3f', y_coords_shifted)
+
+        for i, (x, y) in enumerate(zip(x_coords_shifted, y_coords_shifted)):
+            cam_data = camera_data[i]
+            pos = cam_data['position_3d_oriented']
+
+            # Create rich tooltip with metadata
+            tooltip_parts = [
+                f"Camera {i+1}",
+                f"2D: ({x:.2f}, {y:.2f})",
+                f"3D: ({pos[0]:.2f}, {pos[1]:.2f}, {pos[2]:.2f})",
+                f"Image: {cam_data['image_name']}",
+                f"Frame: {cam_data['frame_id']}",
+                f"Height: {pos[2]:.2f}m"
+            ]
+
+            # Add timestamp if available
+            if 'timestamp' in cam_data:
+                tooltip_parts.append(f"Time: {cam_data['timestamp']}")
+
+            # Add camera ID
+            tooltip_parts.append(f"Cam ID: {cam_data['camera_id']}")
+
+            tooltip_text = " | ".join(tooltip_parts)
+
+            w(SVG_CIRCLE_TEMPLATE.format(x=x_strs[i], y=y_strs[i],
+                                         attrs=circle_attrs,
+                                         tooltip=tooltip_text) + '\n')
+
+        # Draw path connecting cameras, reusing the bulk-formatted coordinates
+        path_points = np.char.add(np.char.add(x_strs, ','), y_strs)
+        w(f'  <polyline points="{" ".join(path_points)}" \n')
+        w(f'            fill="none" stroke="red" stroke-width="{stroke_width * 2:.4f}" \n')
+        w(f'            opacity="0.4" />\n')
+
+        # Add center marker for reference (now at origin 0,0)
+        marker_size = circle_radius * 3
+        w(f'  <line x1="{-marker_size}" y1="0" \n')
+        w(f'        x2="{marker_size}" y2="0" \n')
+        w(f'        stroke="blue" stroke-width="{stroke_width:.4f}" opacity="0.5" />\n')
+        w(f'  <line x1="0" y1="{-marker_size}" \n')
+        w(f'        x2="0" y2="{marker_size}" \n')
+        w(f'        stroke="blue" stroke-width="{stroke_width:.4f}" opacity="0.5" />\n')
+
+        w('</svg>')
     
     print(f"  Saved SVG to: {output_file}")
     print(f"  {len(camera_positions)} camera positions rendered")
@@ -318,12 +243,19 @@ def create_top_down_svg(camera_data, R, origin_m, scale, output_file):
     
     # Export point cloud (PTS format)
     pts_output_file = str(output_file).replace('.svg', '.pts')
-    export_point_cloud(camera_data, pts_output_file)
-    
+    export_point_cloud(transformed_positions, pts_output_file)
+
     print(f"  Saved point cloud to: {pts_output_file}")
-    print(f"  {len(camera_data)} points exported")
+    print(f"  {len(transformed_positions)} points exported")
+
+@functools.lru_cache(maxsize=4)
+def _load_reconstruction(sparse_folder):
+    """Load a pycolmap Reconstruction, cached per folder path so repeated
+    passes over the same folder (e.g. several camera indices) skip the
+    disk read and binary parse."""
+    return pycolmap.Reconstruction(sparse_folder)
 
-def process_single_reconstruction(sparse_folder, output_dir, camera_index=1, 
+def process_single_reconstruction(sparse_folder, output_dir, camera_index=1,
                                 origin_feet=(67.472490761, -23.114793212, 151.586679018),
                                 scale=1.65):
     """
@@ -334,9 +266,9 @@ def process_single_reconstruction(sparse_folder, output_dir, camera_index=1,
     print(f"PROCESSING FOLDER: {folder_name}")
     print(f"{'='*70}")
     
-    # Load reconstruction
+    # Load reconstruction (cached per folder path)
     print("Loading COLMAP reconstruction...")
-    recon = pycolmap.Reconstruction(str(sparse_folder))
+    recon = _load_reconstruction(str(sparse_folder))
     print(f"  Total images: {recon.num_images()}")
     print(f"  Total 3D points: {recon.num_points3D()}")
     
@@ -349,8 +281,11 @@ def process_single_reconstruction(sparse_folder, output_dir, camera_index=1,
         print("  Warning: Not enough camera positions for gravity estimation. Skipping...")
         return False
     
-    # Extract positions for gravity estimation
-    camera_positions = np.array([cam['position_3d'] for cam in camera_data])
+    # Extract positions for gravity estimation; force a C-contiguous float64
+    # block so the covariance matmul and eigh hit the fast LAPACK paths
+    # without internal copies
+    camera_positions = np.ascontiguousarray(
+        np.stack([cam['position_3d'] for cam in camera_data]), dtype=np.float64)
     
     # Estimate gravity direction using PCA
     print("\nEstimating gravity direction from camera plane...")
@@ -363,13 +298,29 @@ def process_single_reconstruction(sparse_folder, output_dir, camera_index=1,
     # Convert origin to meters for transformations
     origin_m = np.array(origin_feet) * 0.3048
     
-    # Generate SVG with enhanced metadata
+    # Generate SVG with enhanced metadata, reusing the position block built
+    # for the gravity fit
     svg_file = output_dir / f'camera_positions_{folder_name}.svg'
-    create_top_down_svg(camera_data, R, origin_m, scale, svg_file)
+    create_top_down_svg(camera_data, R, origin_m, scale, svg_file,
+                        camera_positions=camera_positions)
     
     print(f"\nSuccessfully processed folder {folder_name}")
     return True
 
+def _worker(task):
+    """Process one reconstruction folder in a worker process."""
+    sparse_folder, output_dir, camera_index, origin_feet, scale = task
+    try:
+        return process_single_reconstruction(
+            sparse_folder, output_dir,
+            camera_index=camera_index,
+            origin_feet=origin_feet,
+            scale=scale
+        )
+    except Exception as e:
+        print(f"Error processing folder {sparse_folder.name}: {e}")
+        return False
+
 def main():
     parser = argparse.ArgumentParser(description='Process multiple COLMAP reconstructions with gravity correction')
     parser.add_argument('--sparse-dir', default='D:/Camera01/reconstruction_mask3_012_previews_run/sparse', help='Path to sparse directory containing numbered folders')
@@ -413,22 +364,18 @@ def main():
     print(f"Origin: {args.origin_feet}")
     print(f"Scale: {args.scale}")
     
-    # Process each folder
-    success_count = 0
-    for folder_num in folder_numbers:
-        sparse_folder = sparse_dir / str(folder_num)
-        
-        try:
-            success = process_single_reconstruction(
-                sparse_folder, output_dir, 
-                camera_index=args.camera_index,
-                origin_feet=tuple(args.origin_feet),
-                scale=args.scale
-            )
-            if success:
-                success_count += 1
-        except Exception as e:
-            print(f"Error processing folder {folder_num}: {e}")
+    # Each folder is an independent load/PCA/SVG job, so fan them out
+    # across processes when there is more than one
+    tasks = [(sparse_dir / str(folder_num), output_dir, args.camera_index,
+              tuple(args.origin_feet), args.scale) for folder_num in folder_numbers]
+
+    if len(tasks) > 1:
+        with multiprocessing.Pool(processes=min(len(tasks), os.cpu_count())) as pool:
+            results = pool.map(_worker, tasks)
+    else:
+        results = [_worker(task) for task in tasks]
+
+    success_count = sum(1 for success in results if success)
     
     print(f"\n{'='*70}")
     print(f"SUMMARY")
@@ -5,18 +5,17 @@ Convert EDENTM2000 coordinates to WGS84 for floor plan bounds.
 
 import json
 from pathlib import Path
+import numpy as np
+import orjson
 import pyproj
 
+# Transformer construction loads PROJ's database and is far more expensive
+# than a transform, so build it once at module scope
+_MT_EDEN_TO_WGS84 = pyproj.Transformer.from_crs('EPSG:2105', 'EPSG:4326', always_xy=True)
+
 def convert_mt_eden_to_wgs84(easting, northing):
     """Convert Mt Eden 2000 (EPSG:2105) to WGS84 (EPSG:4326)."""
-    # Define projections
-    mt_eden = pyproj.Proj('EPSG:2105')
-    wgs84 = pyproj.Proj('EPSG:4326')
-    
-    # Transform
-    transformer = pyproj.Transformer.from_proj(mt_eden, wgs84, always_xy=True)
-    lng, lat = transformer.transform(easting, northing)
-    
+    lng, lat = _MT_EDEN_TO_WGS84.transform(easting, northing)
     return [lng, lat]
 
 def create_floor_plan_bounds(points):
@@ -24,11 +23,12 @@ def create_floor_plan_bounds(points):
     if not points:
         return None
     
-    xs = [p['x'] for p in points]
-    ys = [p['y'] for p in points]
-    
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
+    # One C-level reduction over an (N,2) array instead of Python min/max
+    # over per-point lists
+    pts = np.fromiter(((p['x'], p['y']) for p in points),
+                      dtype=np.dtype((float, 2)), count=len(points))
+    min_x, min_y = pts.min(axis=0)
+    max_x, max_y = pts.max(axis=0)
     
     print(f"  Mt Eden 2000 bounds:")
     print(f"    X (Easting): {min_x:.2f} to {max_x:.2f}")
@@ -42,13 +42,17 @@ def create_floor_plan_bounds(points):
         'bottomLeft': [min_x, min_y]
     }
     
-    # Convert each corner to WGS84
+    # Convert all four corners to WGS84 in one batched transform call
+    corner_names = list(corners_mt_eden.keys())
+    es = [corners_mt_eden[name][0] for name in corner_names]
+    ns = [corners_mt_eden[name][1] for name in corner_names]
+    lngs, lats = _MT_EDEN_TO_WGS84.transform(es, ns)
+
     corners_wgs84 = {}
     coordinates_wgs84 = []
-    
+
     print(f"\n  WGS84 bounds:")
-    for corner_name, (e, n) in corners_mt_eden.items():
-        lng, lat = convert_mt_eden_to_wgs84(e, n)
+    for corner_name, lng, lat in zip(corner_names, lngs, lats):
         corners_wgs84[corner_name] = [lng, lat]
         coordinates_wgs84.append([lng, lat])
         print(f"    {corner_name}: [{lng:.14f}, {lat:.14f}]")
@@ -89,16 +93,16 @@ def main():
         if bounds:
             all_bounds[floor_name] = bounds
             
-            # Save individual floor bounds
+            # Save individual floor bounds (orjson formats floats natively)
             output_file = output_dir / f'{floor_name}_wgs84_bounds.json'
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(bounds, f, indent=2)
+            output_file.write_bytes(
+                orjson.dumps(bounds, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
             print(f"\n  Saved to: {output_file}")
     
     # Save combined bounds
     combined_file = output_dir / 'all_floors_wgs84_bounds.json'
-    with open(combined_file, 'w', encoding='utf-8') as f:
-        json.dump(all_bounds, f, indent=2)
+    combined_file.write_bytes(
+        orjson.dumps(all_bounds, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     print(f"\n{'='*60}")
     print(f"Saved combined bounds to: {combined_file}")
     print(f"{'='*60}")
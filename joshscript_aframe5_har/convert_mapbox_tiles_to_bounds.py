@@ -3,29 +3,60 @@
 Convert Mapbox tile coordinates to WGS84 bounds
 """
 
+import functools
 import json
 import math
+import sys
+
+import numpy as np
+
+@functools.lru_cache(maxsize=32)
+def _pow2(z):
+    """Tiles per axis at zoom level z, cached across calls."""
+    return 2.0 ** z
 
 def tile_to_lng_lat(x, y, z):
     """Convert Mapbox tile coordinates to longitude/latitude"""
-    n = 2.0 ** z
+    n = _pow2(z)
     lng = x / n * 360.0 - 180.0
-    lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    # Gudermannian form: atan(sinh(t)) == 2*atan(exp(t)) - pi/2, one
+    # transcendental cheaper since sinh itself expands to two exps
+    t = math.pi * (1 - 2 * y / n)
+    lat = math.degrees(2.0 * math.atan(math.exp(t)) - math.pi / 2.0)
     return lng, lat
 
+def tile_to_lng_lat_vec(xs, ys, zs):
+    """
+    Convert arrays of Mapbox tile coordinates to longitude/latitude.
+
+    Same math as tile_to_lng_lat, but one vectorized transcendental
+    dispatch over the whole tile set instead of a per-tile Python call.
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    n = 2.0 ** np.asarray(zs, dtype=np.float64)
+    lngs = xs / n * 360.0 - 180.0
+    # Same Gudermannian form as the scalar path: exp + arctan instead of
+    # sinh + arctan, one transcendental ufunc sweep fewer
+    t = np.pi * (1 - 2 * ys / n)
+    lats = np.degrees(2.0 * np.arctan(np.exp(t)) - np.pi * 0.5)
+    return lngs, lats
+
+@functools.lru_cache(maxsize=4096)
 def get_tile_bounds(x, y, z):
-    """Get the bounds of a Mapbox tile in WGS84 coordinates"""
+    """Get the bounds of a Mapbox tile in WGS84 coordinates.
+
+    Returns a (min_lng, max_lng, min_lat, max_lat) tuple. Tuples are
+    hashable and allocation-free to hand back from the cache, which
+    memoizes the trig for tiles shared across floors and zoom groups.
+    """
     # Top-left corner
     lng1, lat1 = tile_to_lng_lat(x, y, z)
-    # Bottom-right corner  
+    # Bottom-right corner
     lng2, lat2 = tile_to_lng_lat(x + 1, y + 1, z)
-    
-    return {
-        'min_lng': lng1,
-        'max_lng': lng2,
-        'min_lat': lat2,  # Note: lat2 is smaller (more south)
-        'max_lat': lat1   # Note: lat1 is larger (more north)
-    }
+
+    # lat2 is smaller (more south), lat1 is larger (more north)
+    return lng1, lng2, lat2, lat1
 
 def main():
     # Load the floor plan data
@@ -36,39 +67,39 @@ def main():
     print(f"Floor plan URL: {data['floorplan_url']}")
     print()
     
-    # Analyze each zoom level
-    zoom_levels = {}
-    for tile in data['mapbox_data']:
-        z = tile['z']
-        x = tile['x']
-        y = tile['y']
-        
-        if z not in zoom_levels:
-            zoom_levels[z] = []
-        zoom_levels[z].append((x, y))
-    
-    # Convert tiles to bounds
-    all_bounds = []
-    for z, tiles in zoom_levels.items():
-        print(f"Zoom Level {z}:")
-        for x, y in tiles:
-            bounds = get_tile_bounds(x, y, z)
-            all_bounds.append(bounds)
-            print(f"  Tile {x},{y}: {bounds['min_lng']:.6f}, {bounds['min_lat']:.6f} to {bounds['max_lng']:.6f}, {bounds['max_lat']:.6f}")
-        print()
-    
-    # Find the bounds from the highest zoom level (most detailed)
-    if all_bounds:
+    # SoA tile columns: one array build, then two vectorized corner calls
+    # (top-left, then bottom-right at x+1/y+1) feed both the per-tile
+    # analysis printout and the bounds reductions below - no per-tile
+    # get_tile_bounds dicts are built or stored
+    tiles = np.array([(t['x'], t['y'], t['z']) for t in data['mapbox_data']],
+                     dtype=np.float64)
+    if len(tiles):
+        # Old captures may still contain duplicate tile requests from
+        # pans/zooms; reduce to unique rows before any trig
+        tiles = np.unique(tiles, axis=0)
+        xs, ys, zs = tiles[:, 0], tiles[:, 1], tiles[:, 2]
+        lng_tl, lat_tl = tile_to_lng_lat_vec(xs, ys, zs)
+        lng_br, lat_br = tile_to_lng_lat_vec(xs + 1, ys + 1, zs)
+
+        # Analyze each zoom level, buffering the per-tile lines and
+        # emitting them in one write instead of a syscall-per-tile print
+        out = []
+        for z in np.unique(zs):
+            out.append(f"Zoom Level {int(z)}:")
+            for i in np.flatnonzero(zs == z):
+                out.append(f"  Tile {int(xs[i])},{int(ys[i])}: {lng_tl[i]:.6f}, {lat_br[i]:.6f} to {lng_br[i]:.6f}, {lat_tl[i]:.6f}")
+            out.append('')
+        sys.stdout.write('\n'.join(out) + '\n')
+
+        # Find the bounds from the highest zoom level (most detailed).
         # Get only zoom level 14 tiles (highest detail)
-        zoom_14_tiles = [tile for tile in data['mapbox_data'] if tile['z'] == 14]
-        zoom_14_bounds = [get_tile_bounds(tile['x'], tile['y'], tile['z']) for tile in zoom_14_tiles]
-        
-        if zoom_14_bounds:
-            min_lng = min(b['min_lng'] for b in zoom_14_bounds)
-            max_lng = max(b['max_lng'] for b in zoom_14_bounds)
-            min_lat = min(b['min_lat'] for b in zoom_14_bounds)
-            max_lat = max(b['max_lat'] for b in zoom_14_bounds)
-            
+        mask = zs == 14
+        if mask.any():
+            min_lng = lng_tl[mask].min()
+            max_lng = lng_br[mask].max()
+            min_lat = lat_br[mask].min()
+            max_lat = lat_tl[mask].max()
+
             print("=== ZOOM 14 BOUNDS (HIGHEST DETAIL) ===")
             print(f"Min Lng: {min_lng:.6f}")
             print(f"Max Lng: {max_lng:.6f}")
@@ -77,11 +108,11 @@ def main():
             print()
         else:
             # Fallback to overall bounds
-            min_lng = min(b['min_lng'] for b in all_bounds)
-            max_lng = max(b['max_lng'] for b in all_bounds)
-            min_lat = min(b['min_lat'] for b in all_bounds)
-            max_lat = max(b['max_lat'] for b in all_bounds)
-            
+            min_lng = lng_tl.min()
+            max_lng = lng_br.max()
+            min_lat = lat_br.min()
+            max_lat = lat_tl.max()
+
             print("=== OVERALL BOUNDS (FALLBACK) ===")
             print(f"Min Lng: {min_lng:.6f}")
             print(f"Max Lng: {max_lng:.6f}")
@@ -3,25 +3,29 @@
 Extract floor plan coordinates from browser using the process from GEOLOCATION_EXTRACTION_PROCESS.md
 """
 
-import json
 import webbrowser
 import time
 import os
 
+import ijson
+
 def main():
-    # Load the Ground Floor HAR data to get the floor plan URL
-    with open('har_files/projects.asbuiltvault.com_GroundFloor.har', 'r') as f:
-        har_data = json.load(f)
-    
-    # Find the floor plan URL from the HAR data
+    # Find the floor plan URL from the HAR data. Stream entries with ijson
+    # so the scan stops reading the file as soon as the URL is found, and
+    # run the checks cheapest-first: mime type, then the short request URL.
+    # The blob-host test used to substring-search the response body, which
+    # for images is a multi-MB base64 payload; the URL field carries the
+    # same host in a few dozen characters.
     floorplan_url = None
-    for entry in har_data['log']['entries']:
-        if 'response' in entry and 'content' in entry['response']:
-            content = entry['response']['content']
-            if 'mimeType' in content and 'image' in content['mimeType']:
-                if 'text' in content and 'vaultprojectswebprod.blob.core.windows.net' in content['text']:
-                    floorplan_url = entry['request']['url']
-                    break
+    with open('har_files/projects.asbuiltvault.com_GroundFloor.har', 'rb') as f:
+        for entry in ijson.items(f, 'log.entries.item'):
+            content = entry.get('response', {}).get('content', {})
+            if not content.get('mimeType', '').startswith('image/'):
+                continue
+            url = entry.get('request', {}).get('url', '')
+            if url.startswith('https://vaultprojectswebprod.blob.core.windows.net'):
+                floorplan_url = url
+                break
     
     if not floorplan_url:
         print("❌ Could not find floor plan URL in HAR file")
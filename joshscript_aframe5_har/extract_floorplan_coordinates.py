@@ -3,19 +3,26 @@
 Extract precise floor plan coordinates from HAR files.
 """
 
-import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+from har_io import iter_har_entries, json_dump, json_loads
+
+# Case-insensitive hint that a response body may mention coordinates; one
+# regex scan of the raw text avoids building a lowercased copy of every
+# (potentially multi-MB) body just to run three substring checks
+_COORD_HINT = re.compile(r'lat|lng|coordinate', re.IGNORECASE)
+
+# Fields pulled out of the application API payload
+_APP_KEYS = ('id', 'name', 'type', 'map_file_name', 'latitude', 'longitude',
+             'map_location')
+
 def extract_floorplan_coordinates(har_path):
     """Extract floor plan coordinates from a HAR file."""
     print(f"\nProcessing: {har_path.name}")
-    
-    with open(har_path, 'r', encoding='utf-8') as f:
-        har_data = json.load(f)
-    
-    entries = har_data.get('log', {}).get('entries', [])
-    
+
     floorplan_data = {
         'application_data': None,
         'coordinates': {},
@@ -23,106 +30,131 @@ def extract_floorplan_coordinates(har_path):
         'raw_responses': []
     }
     
-    # Look for the specific application API response
-    for entry in entries:
+    # Single pass over the entries: the application API handler and the
+    # generic coordinate-pattern scan used to be two full sweeps, each
+    # decoding matching response bodies on its own. Dispatching by URL
+    # inside one loop reads the HAR once and parses each body at most once.
+    for entry in iter_har_entries(har_path):
         request = entry.get('request', {})
         response = entry.get('response', {})
         url = request.get('url', '')
-        
+        content = response.get('content', {})
+        text = content.get('text', '')
+
+        if not text:
+            continue
+
+        parsed = None
+
         # Look for the application-specific API call
         if 'api/vault/asset' in url and 'application' in url:
-            content = response.get('content', {})
-            text = content.get('text', '')
-            
-            if text:
-                try:
-                    api_data = json.loads(text)
-                    floorplan_data['raw_responses'].append({
-                        'url': url,
-                        'data': api_data
-                    })
-                    
-                    # Extract application data
-                    if 'data' in api_data and 'data' in api_data['data']:
-                        app_data = api_data['data']['data']
-                        
-                        floorplan_data['application_data'] = {
-                            'id': app_data.get('id'),
-                            'name': app_data.get('name'),
-                            'type': app_data.get('type'),
-                            'map_file_name': app_data.get('map_file_name'),
-                            'latitude': app_data.get('latitude'),
-                            'longitude': app_data.get('longitude'),
-                            'map_location': app_data.get('map_location')
-                        }
-                        
-                        print(f"  Found application data:")
-                        print(f"    Name: {app_data.get('name')}")
-                        print(f"    File: {app_data.get('map_file_name')}")
-                        print(f"    Lat: {app_data.get('latitude')}")
-                        print(f"    Lng: {app_data.get('longitude')}")
-                        print(f"    Location: {app_data.get('map_location')}")
-                        
-                        # Store coordinates
-                        floorplan_data['coordinates'] = {
-                            'latitude': app_data.get('latitude'),
-                            'longitude': app_data.get('longitude')
-                        }
-                        
-                except Exception as e:
-                    print(f"  Error parsing API response: {e}")
-    
-    # Look for any other coordinate-related data
-    for entry in entries:
-        request = entry.get('request', {})
-        response = entry.get('response', {})
-        url = request.get('url', '')
-        
+            try:
+                parsed = json_loads(text)
+                floorplan_data['raw_responses'].append({
+                    'url': url,
+                    'data': parsed
+                })
+
+                # Extract application data; bind the nested dict and
+                # its .get once instead of re-walking parsed['data']
+                # ['data'] and re-fetching each field for the prints
+                outer = parsed.get('data')
+                if isinstance(outer, dict) and 'data' in outer:
+                    get = outer['data'].get
+                    app_info = {key: get(key) for key in _APP_KEYS}
+
+                    floorplan_data['application_data'] = app_info
+
+                    print(f"  Found application data:")
+                    print(f"    Name: {app_info['name']}")
+                    print(f"    File: {app_info['map_file_name']}")
+                    print(f"    Lat: {app_info['latitude']}")
+                    print(f"    Lng: {app_info['longitude']}")
+                    print(f"    Location: {app_info['map_location']}")
+
+                    # Store coordinates
+                    floorplan_data['coordinates'] = {
+                        'latitude': app_info['latitude'],
+                        'longitude': app_info['longitude']
+                    }
+
+            except Exception as e:
+                print(f"  Error parsing API response: {e}")
+
+        # Look for any other coordinate-related data, reusing the parse
+        # from above when the entry matched both branches. The mime
+        # type and a first-byte peek reject non-JSON bodies before the
+        # hint regex and the parser ever touch them.
         if 'projects.asbuiltvault.com' in url:
-            content = response.get('content', {})
-            text = content.get('text', '')
-            
-            if text and ('lat' in text.lower() or 'lng' in text.lower() or 'coordinate' in text.lower()):
+            mime = content.get('mimeType', '')
+            if ((not mime or mime.startswith('application/json'))
+                    and text.lstrip()[:1] in ('{', '[')
+                    and _COORD_HINT.search(text)):
                 try:
-                    data = json.loads(text)
+                    if parsed is None:
+                        parsed = json_loads(text)
                     # Search for coordinate patterns
-                    coord_patterns = find_coordinate_patterns(data)
+                    coord_patterns = find_coordinate_patterns(parsed)
                     if coord_patterns:
                         floorplan_data['map_data'][url] = coord_patterns
                 except:
                     pass
-    
+
     return floorplan_data
 
-def find_coordinate_patterns(data, path=""):
-    """Recursively find coordinate patterns in JSON data."""
+# Keys whose values look like coordinates
+_COORD_KEYS = frozenset({'lat', 'latitude', 'lng', 'longitude', 'x', 'y',
+                         'easting', 'northing'})
+
+def find_coordinate_patterns(data):
+    """Find coordinate patterns anywhere in nested JSON data.
+
+    Iterative depth-first walk with an explicit stack: paths are carried
+    as segment tuples and only joined into strings for actual matches, so
+    the traversal does no per-node string concatenation and cannot hit the
+    recursion limit on deeply nested API responses.
+    """
     patterns = []
-    
-    if isinstance(data, dict):
-        for key, value in data.items():
-            current_path = f"{path}.{key}" if path else key
-            
-            # Look for coordinate-like values
-            if key.lower() in ['lat', 'latitude', 'lng', 'longitude', 'x', 'y', 'easting', 'northing']:
-                if isinstance(value, (int, float)) and abs(value) > 0:
-                    patterns.append({
-                        'path': current_path,
-                        'key': key,
-                        'value': value
-                    })
-            
-            # Recursively search nested objects
-            if isinstance(value, (dict, list)):
-                patterns.extend(find_coordinate_patterns(value, current_path))
-    
-    elif isinstance(data, list):
-        for i, item in enumerate(data):
-            current_path = f"{path}[{i}]"
-            if isinstance(item, (dict, list)):
-                patterns.extend(find_coordinate_patterns(item, current_path))
-    
+    stack = [(data, ())]
+
+    while stack:
+        node, path = stack.pop()
+
+        if isinstance(node, dict):
+            for key, value in node.items():
+                # Look for coordinate-like values
+                if key.lower() in _COORD_KEYS:
+                    if isinstance(value, (int, float)) and abs(value) > 0:
+                        patterns.append({
+                            'path': ''.join(path + ('.' + key,)).lstrip('.'),
+                            'key': key,
+                            'value': value
+                        })
+
+                # Search nested objects
+                if isinstance(value, (dict, list)):
+                    stack.append((value, path + ('.' + key,)))
+
+        elif isinstance(node, list):
+            for i, item in enumerate(node):
+                if isinstance(item, (dict, list)):
+                    stack.append((item, path + (f'[{i}]',)))
+
     return patterns
 
+def _process_har_file(har_file):
+    """Worker: extract one HAR file and save its per-floor output."""
+    output_dir = Path(__file__).parent / 'floorplan_coordinates'
+    floor_name = har_file.stem.replace('projects.asbuiltvault.com_', '')
+    data = extract_floorplan_coordinates(har_file)
+
+    # Save individual floor data in the worker so only the summary-sized
+    # dict crosses the process boundary
+    output_file = output_dir / f'{floor_name}_coordinates.json'
+    json_dump(data, output_file)
+    print(f"  Saved to: {output_file}")
+    return floor_name, data
+
 def main():
     script_dir = Path(__file__).parent
     har_files_dir = script_dir / 'har_files'
@@ -134,22 +166,17 @@ def main():
     print(f"Found {len(har_files)} HAR files")
     
     all_coordinates = {}
-    
-    for har_file in har_files:
-        floor_name = har_file.stem.replace('projects.asbuiltvault.com_', '')
-        data = extract_floorplan_coordinates(har_file)
-        all_coordinates[floor_name] = data
-        
-        # Save individual floor data
-        output_file = output_dir / f'{floor_name}_coordinates.json'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
-        print(f"  Saved to: {output_file}")
+
+    # Each HAR is independent, so fan the files out across processes
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {executor.submit(_process_har_file, f): f for f in har_files}
+        for future in as_completed(futures):
+            floor_name, data = future.result()
+            all_coordinates[floor_name] = data
     
     # Save combined data
     combined_file = output_dir / 'all_floors_coordinates.json'
-    with open(combined_file, 'w', encoding='utf-8') as f:
-        json.dump(all_coordinates, f, indent=2)
+    json_dump(all_coordinates, combined_file, indent=False)
     print(f"\nSaved combined data to: {combined_file}")
     
     # Print summary
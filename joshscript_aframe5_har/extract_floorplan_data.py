@@ -3,64 +3,96 @@
 Extract floor plan images and coordinate data from HAR files.
 """
 
-import json
 import base64
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 import re
 
-def extract_floorplan_from_har(har_path):
-    """Extract floor plan data from a HAR file."""
+from har_io import iter_har_entries, json_dump, json_loads
+
+# Mapbox vector-tile URL pattern, compiled once; the per-entry loop
+# guards with cheap substring checks before dispatching the regex
+_TILE_RE = re.compile(r'/(\d+)/(\d+)/(\d+)\.vector\.pbf')
+
+def extract_floorplan_from_har(har_path, output_dir):
+    """Extract floor plan data from a HAR file.
+
+    Base64 image payloads are written straight to output_dir as they are
+    seen and only their path is kept, so the multi-MB blob never sits in
+    the returned dict.
+    """
     print(f"\nProcessing: {har_path.name}")
-    
-    with open(har_path, 'r', encoding='utf-8') as f:
-        har_data = json.load(f)
-    
-    entries = har_data.get('log', {}).get('entries', [])
-    
+
+    floor_name = har_path.stem.replace('projects.asbuiltvault.com_', '')
+
     floorplan_data = {
         'floorplan_url': None,
-        'floorplan_image_base64': None,
+        'floorplan_image_path': None,
         'geolocation_bounds': None,
         'mapbox_data': [],
         'image_sources': []
     }
+
+    # Panning/zooming makes browsers request the same tile repeatedly;
+    # keep each (z, x, y) once so downstream trig never repeats work
+    seen_tiles = set()
     
-    # Look for floor plan images
-    for entry in entries:
+    # Look for floor plan images; iter_har_entries parses small HARs
+    # wholesale and streams large ones entry by entry.
+    for entry in iter_har_entries(har_path):
         request = entry.get('request', {})
         response = entry.get('response', {})
         url = request.get('url', '')
-        
+
         # Check if this is a floor plan image (from blob storage)
         if 'vaultprojectswebprod.blob.core.windows.net' in url or 'f9dba6e1-98a8-458e-b9dc-5f67913f2872' in url:
             print(f"  Found floor plan URL: {url}")
             floorplan_data['floorplan_url'] = url
             floorplan_data['image_sources'].append(url)
-            
+
             # Try to extract image data
             content = response.get('content', {})
             encoding = content.get('encoding', '')
             text = content.get('text', '')
-            
+
             if encoding == 'base64' and text:
-                print(f"  Extracted base64 image data ({len(text)} bytes)")
-                floorplan_data['floorplan_image_base64'] = text
-        
+                image_file = Path(output_dir) / f'{floor_name}_image.txt'
+                image_file.write_text(text)
+                print(f"  Saved base64 image data ({len(text)} bytes) to: {image_file}")
+                floorplan_data['floorplan_image_path'] = str(image_file)
+
         # Look for Mapbox tile requests with coordinates
         if 'api.mapbox.com' in url and '.vector.pbf' in url:
             # Extract tile coordinates from URL
-            match = re.search(r'/(\d+)/(\d+)/(\d+)\.vector\.pbf', url)
+            match = _TILE_RE.search(url)
             if match:
-                z, x, y = match.groups()
-                floorplan_data['mapbox_data'].append({
-                    'z': int(z),
-                    'x': int(x),
-                    'y': int(y),
-                    'url': url
-                })
-    
+                z, x, y = (int(g) for g in match.groups())
+                if (z, x, y) not in seen_tiles:
+                    seen_tiles.add((z, x, y))
+                    floorplan_data['mapbox_data'].append({
+                        'z': z,
+                        'x': x,
+                        'y': y,
+                        'url': url
+                    })
+
     return floorplan_data
 
+def _process_har_file(har_file):
+    """Worker: extract one HAR file and save its per-floor outputs."""
+    output_dir = Path(__file__).parent / 'floorplan_data'
+    floor_name = har_file.stem.replace('projects.asbuiltvault.com_', '')
+    data = extract_floorplan_from_har(har_file, output_dir)
+
+    # Save individual floor data (the image was already streamed to disk
+    # during extraction, so data holds only its path)
+    output_file = output_dir / f'{floor_name}_data.json'
+    json_dump(data, output_file)
+    print(f"  Saved to: {output_file}")
+
+    return floor_name, data, bool(data['floorplan_image_path'])
+
 def main():
     # Get the script directory
     script_dir = Path(__file__).parent
@@ -73,34 +105,20 @@ def main():
     print(f"Found {len(har_files)} HAR files")
     
     all_data = {}
+    image_extracted = {}
+
+    # Each HAR is independent, so fan the files out across processes; the
+    # workers write their own per-floor outputs
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {executor.submit(_process_har_file, f): f for f in har_files}
+        for future in as_completed(futures):
+            floor_name, json_data, has_image = future.result()
+            all_data[floor_name] = json_data
+            image_extracted[floor_name] = has_image
     
-    for har_file in har_files:
-        floor_name = har_file.stem.replace('projects.asbuiltvault.com_', '')
-        data = extract_floorplan_from_har(har_file)
-        all_data[floor_name] = data
-        
-        # Save individual floor data
-        output_file = output_dir / f'{floor_name}_data.json'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            # Don't include base64 data in JSON (too large)
-            json_data = {k: v for k, v in data.items() if k != 'floorplan_image_base64'}
-            json.dump(json_data, f, indent=2)
-        print(f"  Saved to: {output_file}")
-        
-        # Save base64 image if found
-        if data['floorplan_image_base64']:
-            image_file = output_dir / f'{floor_name}_image.txt'
-            with open(image_file, 'w', encoding='utf-8') as f:
-                f.write(data['floorplan_image_base64'])
-            print(f"  Saved base64 image to: {image_file}")
-    
-    # Save combined data
+    # Save combined data (the dicts only reference image paths, not blobs)
     combined_file = output_dir / 'all_floors_data.json'
-    with open(combined_file, 'w', encoding='utf-8') as f:
-        # Don't include base64 data
-        combined_data = {k: {kk: vv for kk, vv in v.items() if kk != 'floorplan_image_base64'} 
-                        for k, v in all_data.items()}
-        json.dump(combined_data, f, indent=2)
+    json_dump(all_data, combined_file, indent=False)
     print(f"\nSaved combined data to: {combined_file}")
     
     # Print summary
@@ -108,7 +126,7 @@ def main():
     for floor_name, data in all_data.items():
         print(f"\n{floor_name}:")
         print(f"  Floor plan URL found: {'Yes' if data['floorplan_url'] else 'No'}")
-        print(f"  Image data extracted: {'Yes' if data['floorplan_image_base64'] else 'No'}")
+        print(f"  Image data extracted: {'Yes' if image_extracted[floor_name] else 'No'}")
         print(f"  Mapbox tiles: {len(data['mapbox_data'])}")
         print(f"  Image sources: {len(data['image_sources'])}")
 
@@ -3,40 +3,56 @@
 Extract geolocation bounds from HAR files for floor plans.
 """
 
-import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+import numpy as np
+
+from convert_mapbox_tiles_to_bounds import tile_to_lng_lat
+from har_io import iter_har_entries, json_dump, json_loads
+
+# Mapbox vector-tile URL pattern, compiled once; the per-entry loop
+# guards with cheap substring checks before dispatching the regex
+_TILE_RE = re.compile(r'/(\d+)/(\d+)/(\d+)\.vector\.pbf')
+
 def extract_geolocation_from_har(har_path):
     """Extract geolocation bounds from a HAR file."""
     print(f"\nProcessing: {har_path.name}")
-    
-    with open(har_path, 'r', encoding='utf-8') as f:
-        har_data = json.load(f)
-    
-    entries = har_data.get('log', {}).get('entries', [])
-    
+
     geolocation_data = {
         'floorplan_bounds': None,
         'mapbox_bounds': None,
         'api_responses': [],
         'coordinate_data': []
     }
-    
-    # Look for API responses that might contain coordinate data
-    for entry in entries:
+
+    # SoA companion to coordinate_data: (z, x, y) tuples accumulated once
+    # so the bounds math below runs on integer array columns instead of
+    # re-scanning the per-tile dicts
+    tile_zxy = []
+
+    # Look for API responses that might contain coordinate data;
+    # iter_har_entries parses small HARs wholesale and streams large ones
+    for entry in iter_har_entries(har_path):
         request = entry.get('request', {})
         response = entry.get('response', {})
         url = request.get('url', '')
-        
+
         # Check for AsBuiltVault API responses
         if 'projects.asbuiltvault.com/api' in url:
             content = response.get('content', {})
             text = content.get('text', '')
-            
-            if text:
+            mime = content.get('mimeType', '')
+
+            # Skip the parser for bodies that cannot be JSON: trust the
+            # HAR mime type when present, then peek at the first
+            # non-space byte to reject HTML/JS without tokenizing it
+            if (text and (not mime or mime.startswith('application/json'))
+                    and text.lstrip()[:1] in ('{', '[')):
                 try:
-                    api_data = json.loads(text)
+                    api_data = json_loads(text)
                     geolocation_data['api_responses'].append({
                         'url': url,
                         'data': api_data
@@ -44,63 +60,73 @@ def extract_geolocation_from_har(har_path):
                     print(f"  Found API response: {url}")
                 except:
                     pass
-        
+
         # Look for Mapbox tile requests to infer bounds
         if 'api.mapbox.com' in url and '.vector.pbf' in url:
-            match = re.search(r'/(\d+)/(\d+)/(\d+)\.vector\.pbf', url)
+            match = _TILE_RE.search(url)
             if match:
                 z, x, y = match.groups()
+                z, x, y = int(z), int(x), int(y)
                 geolocation_data['coordinate_data'].append({
-                    'z': int(z),
-                    'x': int(x),
-                    'y': int(y),
+                    'z': z,
+                    'x': x,
+                    'y': y,
                     'url': url
                 })
+                tile_zxy.append((z, x, y))
     
     # Try to extract bounds from Mapbox tiles
-    if geolocation_data['coordinate_data']:
-        tiles = geolocation_data['coordinate_data']
-        z_values = [t['z'] for t in tiles]
-        x_values = [t['x'] for t in tiles]
-        y_values = [t['y'] for t in tiles]
-        
-        if z_values:
-            max_z = max(z_values)
-            # Filter tiles at the highest zoom level
-            high_zoom_tiles = [t for t in tiles if t['z'] == max_z]
-            
-            if high_zoom_tiles:
-                min_x = min(t['x'] for t in high_zoom_tiles)
-                max_x = max(t['x'] for t in high_zoom_tiles)
-                min_y = min(t['y'] for t in high_zoom_tiles)
-                max_y = max(t['y'] for t in high_zoom_tiles)
+    if tile_zxy:
+        zxy = np.array(tile_zxy, dtype=np.int64)
+        zs, xs, ys = zxy[:, 0], zxy[:, 1], zxy[:, 2]
+
+        max_z = int(zs.max())
+        # Filter tiles at the highest zoom level
+        mask = zs == max_z
+
+        min_x = int(xs[mask].min())
+        max_x = int(xs[mask].max())
+        min_y = int(ys[mask].min())
+        max_y = int(ys[mask].max())
                 
-                # Convert tile coordinates to lat/lng bounds
-                # This is a rough approximation
-                n = 2 ** max_z
-                lng_min = (min_x / n) * 360.0 - 180.0
-                lng_max = ((max_x + 1) / n) * 360.0 - 180.0
-                lat_max = 180.0 / 3.14159 * (2 * 3.14159 * (1 - min_y / n) - 3.14159)
-                lat_min = 180.0 / 3.14159 * (2 * 3.14159 * (1 - (max_y + 1) / n) - 3.14159)
+        # Convert tile corners to lat/lng bounds via the shared Web
+        # Mercator helper. The old inline math was linear in y (it lacked
+        # the atan/exp Gudermannian term) and used a 6-digit pi, so the
+        # latitude bounds it produced were simply wrong.
+        lng_min, lat_max = tile_to_lng_lat(min_x, min_y, max_z)
+        lng_max, lat_min = tile_to_lng_lat(max_x + 1, max_y + 1, max_z)
                 
-                geolocation_data['mapbox_bounds'] = {
-                    'zoom': max_z,
-                    'tile_bounds': {
-                        'min_x': min_x, 'max_x': max_x,
-                        'min_y': min_y, 'max_y': max_y
-                    },
-                    'geo_bounds': {
-                        'lng_min': lng_min, 'lng_max': lng_max,
-                        'lat_min': lat_min, 'lat_max': lat_max
-                    }
-                }
+        geolocation_data['mapbox_bounds'] = {
+            'zoom': max_z,
+            'tile_bounds': {
+                'min_x': min_x, 'max_x': max_x,
+                'min_y': min_y, 'max_y': max_y
+            },
+            'geo_bounds': {
+                'lng_min': lng_min, 'lng_max': lng_max,
+                'lat_min': lat_min, 'lat_max': lat_max
+            }
+        }
                 
-                print(f"  Mapbox bounds (zoom {max_z}):")
-                print(f"    Lng: {lng_min:.6f} to {lng_max:.6f}")
-                print(f"    Lat: {lat_min:.6f} to {lat_max:.6f}")
+        print(f"  Mapbox bounds (zoom {max_z}):")
+        print(f"    Lng: {lng_min:.6f} to {lng_max:.6f}")
+        print(f"    Lat: {lat_min:.6f} to {lat_max:.6f}")
     
     return geolocation_data
 
+def _process_har_file(har_file):
+    """Worker: extract one HAR file and save its per-floor output."""
+    output_dir = Path(__file__).parent / 'geolocation_data'
+    floor_name = har_file.stem.replace('projects.asbuiltvault.com_', '')
+    data = extract_geolocation_from_har(har_file)
+
+    # Save individual floor data in the worker so only the summary-sized
+    # dict crosses the process boundary
+    output_file = output_dir / f'{floor_name}_geolocation.json'
+    json_dump(data, output_file)
+    print(f"  Saved to: {output_file}")
+    return floor_name, data
+
 def main():
     script_dir = Path(__file__).parent
     har_files_dir = script_dir / 'har_files'
@@ -112,22 +138,17 @@ def main():
     print(f"Found {len(har_files)} HAR files")
     
     all_geolocation = {}
-    
-    for har_file in har_files:
-        floor_name = har_file.stem.replace('projects.asbuiltvault.com_', '')
-        data = extract_geolocation_from_har(har_file)
-        all_geolocation[floor_name] = data
-        
-        # Save individual floor data
-        output_file = output_dir / f'{floor_name}_geolocation.json'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
-        print(f"  Saved to: {output_file}")
+
+    # Each HAR is independent, so fan the files out across processes
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {executor.submit(_process_har_file, f): f for f in har_files}
+        for future in as_completed(futures):
+            floor_name, data = future.result()
+            all_geolocation[floor_name] = data
     
     # Save combined data
     combined_file = output_dir / 'all_floors_geolocation.json'
-    with open(combined_file, 'w', encoding='utf-8') as f:
-        json.dump(all_geolocation, f, indent=2)
+    json_dump(all_geolocation, combined_file, indent=False)
     print(f"\nSaved combined data to: {combined_file}")
     
     # Print summary
@@ -4,18 +4,26 @@ Extract the actual WGS84 map bounds from HAR files.
 Looking for the map_url data in the application API response.
 """
 
-import json
+import argparse
 from pathlib import Path
 
-def extract_map_bounds(har_path):
-    """Extract map bounds from HAR file."""
+import ijson
+import numpy as np
+
+from har_io import json_dump, json_loads
+
+# Project UUID identifying the application payload in current captures
+_PROJECT_UUID = 'f9dba6e1-98a8-458e-b9dc-5f67913f2872'
+
+def extract_map_bounds(har_path, project_uuid=_PROJECT_UUID):
+    """Extract map bounds from a HAR file.
+
+    The target payload is identified by project_uuid, so captures from
+    other projects can be mined by passing their UUID instead of
+    editing the scan loop.
+    """
     print(f"\nProcessing: {har_path.name}")
-    
-    with open(har_path, 'r', encoding='utf-8') as f:
-        har_data = json.load(f)
-    
-    entries = har_data.get('log', {}).get('entries', [])
-    
+
     map_data = {
         'application': None,
         'points': [],
@@ -23,77 +31,94 @@ def extract_map_bounds(har_path):
         'coordinate_system': None
     }
     
-    # Look for the application API response
-    for entry in entries:
-        response = entry.get('response', {})
-        content = response.get('content', {})
-        text = content.get('text', '')
-        
-        # Check if this contains the map data
-        if 'map_url' in text and 'f9dba6e1-98a8-458e-b9dc-5f67913f2872' in text:
-            try:
-                api_response = json.loads(text)
-                application = api_response.get('data', {}).get('application', {})
+    # Look for the application API response, streaming entries so the HAR
+    # is never fully resident; the break below also stops the file read early
+    with open(har_path, 'rb') as f:
+        for entry in ijson.items(f, 'log.entries.item'):
+            response = entry.get('response', {})
+            content = response.get('content', {})
+
+            # The application payload is always served as JSON, so a
+            # declared non-JSON mime type rules an entry out before its
+            # body - often a multi-MB base64 image - is even fetched
+            # from the content dict
+            mime = content.get('mimeType', '')
+            if mime and 'json' not in mime:
+                continue
+
+            text = content.get('text', '')
+
+            # Check if this contains the map data. The project UUID is
+            # by far the more selective needle (36 chars, absent from
+            # everything but the one application payload), so testing it
+            # first rejects almost every body after a single C-level
+            # substring sweep instead of two.
+            if project_uuid in text and 'map_url' in text:
+                try:
+                    api_response = json_loads(text)
+                    application = api_response.get('data', {}).get('application', {})
                 
-                map_data['application'] = application
-                map_data['map_url'] = application.get('map_url')
-                map_data['coordinate_system'] = application.get('coordinate_system')
+                    map_data['application'] = application
+                    map_data['map_url'] = application.get('map_url')
+                    map_data['coordinate_system'] = application.get('coordinate_system')
                 
-                # Extract points with coordinates
-                points = application.get('points', [])
-                for point in points:
-                    if 'x' in point and 'y' in point:
-                        map_data['points'].append({
-                            'id': point.get('id'),
-                            'x': point.get('x'),
-                            'y': point.get('y'),
-                            'z': point.get('z'),
-                            'coordinate_system': point.get('coordinate_system', map_data['coordinate_system'])
-                        })
+                    # Extract points with coordinates
+                    points = application.get('points', [])
+                    for point in points:
+                        if 'x' in point and 'y' in point:
+                            map_data['points'].append({
+                                'id': point.get('id'),
+                                'x': point.get('x'),
+                                'y': point.get('y'),
+                                'z': point.get('z'),
+                                'coordinate_system': point.get('coordinate_system', map_data['coordinate_system'])
+                            })
                 
-                print(f"  Found application data:")
-                print(f"    Map URL: {map_data['map_url']}")
-                print(f"    Coordinate System: {map_data['coordinate_system']}")
-                print(f"    Points: {len(map_data['points'])}")
+                    print(f"  Found application data:")
+                    print(f"    Map URL: {map_data['map_url']}")
+                    print(f"    Coordinate System: {map_data['coordinate_system']}")
+                    print(f"    Points: {len(map_data['points'])}")
                 
-                # Show first few points
-                for i, pt in enumerate(map_data['points'][:3]):
-                    print(f"    Point {i+1}: X={pt['x']}, Y={pt['y']}, Z={pt['z']}")
+                    # Show first few points
+                    for i, pt in enumerate(map_data['points'][:3]):
+                        print(f"    Point {i+1}: X={pt['x']}, Y={pt['y']}, Z={pt['z']}")
                 
-                break
+                    break
                 
-            except Exception as e:
-                print(f"  Error parsing application data: {e}")
+                except Exception as e:
+                    print(f"  Error parsing application data: {e}")
     
     return map_data
 
 def main():
+    parser = argparse.ArgumentParser(description='Extract WGS84 map bounds from HAR files')
+    parser.add_argument('--pretty', action='store_true', help='Indent the combined map data JSON (default: compact)')
+    args = parser.parse_args()
+
     script_dir = Path(__file__).parent
     har_files_dir = script_dir / 'har_files'
     output_dir = script_dir / 'map_bounds_data'
     output_dir.mkdir(exist_ok=True)
     
-    har_files = list(har_files_dir.glob('*.har'))
-    
-    print(f"Found {len(har_files)} HAR files")
-    
     all_map_data = {}
-    
-    for har_file in har_files:
+
+    # Consume the glob lazily; the first file starts processing while
+    # the directory scan is still running
+    for har_file in har_files_dir.glob('*.har'):
         floor_name = har_file.stem.replace('projects.asbuiltvault.com_', '')
         data = extract_map_bounds(har_file)
         all_map_data[floor_name] = data
         
         # Save individual floor data
         output_file = output_dir / f'{floor_name}_map_data.json'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        json_dump(data, output_file)
         print(f"  Saved to: {output_file}")
     
+    print(f"\nProcessed {len(all_map_data)} HAR files")
+
     # Save combined data
     combined_file = output_dir / 'all_floors_map_data.json'
-    with open(combined_file, 'w', encoding='utf-8') as f:
-        json.dump(all_map_data, f, indent=2)
+    json_dump(all_map_data, combined_file, indent=args.pretty)
     print(f"\nSaved combined data to: {combined_file}")
     
     # Print summary
@@ -103,10 +128,13 @@ def main():
         print(f"  Coordinate System: {data['coordinate_system']}")
         print(f"  Points: {len(data['points'])}")
         if data['points']:
-            xs = [p['x'] for p in data['points']]
-            ys = [p['y'] for p in data['points']]
-            print(f"  X range: {min(xs):.2f} to {max(xs):.2f}")
-            print(f"  Y range: {min(ys):.2f} to {max(ys):.2f}")
+            # Single fromiter pass per axis feeding SIMD reductions,
+            # instead of building throwaway lists and sweeping each one
+            # twice with Python-level min()/max()
+            xs = np.fromiter((p['x'] for p in data['points']), dtype=np.float64)
+            ys = np.fromiter((p['y'] for p in data['points']), dtype=np.float64)
+            print(f"  X range: {xs.min():.2f} to {xs.max():.2f}")
+            print(f"  Y range: {ys.min():.2f} to {ys.max():.2f}")
 
 if __name__ == '__main__':
     main()
@@ -10,6 +10,64 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime
 import re
 
+import ijson
+
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json when orjson is absent
+    orjson = None
+
+# Below this size one read_bytes + orjson parse of the whole HAR beats
+# streaming (orjson decodes UTF-8 in C in a single pass); larger files
+# take the ijson path so the decoded text and the transient document
+# dict never coexist with the entry list
+_STREAM_THRESHOLD = 32 * 1024 * 1024
+
+# Content types that mark an entry as an image request
+_IMAGE_TYPES = ('image/jpeg', 'image/png', 'image/gif', 'image/webp',
+                'image/svg+xml')
+
+def _stream_log(f) -> Dict[str, Any]:
+    """Assemble the HAR log object in one pass over ijson's event stream.
+
+    Each entry is built and appended as its events arrive, and every
+    other log key - version, creator, pages, and anything ordered after
+    entries such as comment - is assembled alongside, so the file is
+    parsed exactly once and nothing but the finished log is resident.
+    """
+    log: Dict[str, Any] = {}
+    entries: List[Dict] = []
+    builder = None
+    builder_prefix = ''
+    building_entry = False
+    # use_float keeps numeric fields (timings, sizes) as plain floats;
+    # ijson's default Decimals are not JSON-serializable downstream
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == builder_prefix and event in ('end_map', 'end_array'):
+                if building_entry:
+                    entries.append(builder.value)
+                else:
+                    log[builder_prefix[4:]] = builder.value
+                builder = None
+        elif prefix == 'log.entries.item' and event == 'start_map':
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            builder_prefix = prefix
+            building_entry = True
+        elif (prefix.startswith('log.') and '.' not in prefix[4:]
+              and prefix != 'log.entries'):
+            if event in ('start_map', 'start_array'):
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                builder_prefix = prefix
+                building_entry = False
+            else:
+                log[prefix[4:]] = value
+    log['entries'] = entries
+    return log
+
 class HARAnalyzer:
     """Analyzes HAR files to extract relevant data."""
     
@@ -19,6 +77,7 @@ class HARAnalyzer:
         self.creator = {}
         self.browser = {}
         self.version = ""
+        self._scan_cache = None
         
     def load_har_file(self, har_path: Path) -> bool:
         """
@@ -31,21 +90,28 @@ class HARAnalyzer:
             True if successful, False otherwise
         """
         try:
-            # Handle both regular and gzipped HAR files
-            if har_path.suffix == '.gz':
-                with gzip.open(har_path, 'rt', encoding='utf-8') as f:
-                    data = json.load(f)
+            # Small plain HARs are read whole - one read plus orjson's
+            # C parser beats the buffered text-mode json.load path -
+            # while large captures are streamed with ijson so the raw
+            # text and a full document dict are never resident alongside
+            # the entries. Gzipped captures always stream: the size on
+            # disk is the compressed one and says little about the
+            # decoded document, so the threshold cannot be trusted.
+            if (har_path.suffix != '.gz'
+                    and har_path.stat().st_size < _STREAM_THRESHOLD):
+                raw = har_path.read_bytes()
+                data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                self.log = data.get('log', {})
             else:
-                with open(har_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-            
-            # Parse HAR structure
-            self.log = data.get('log', {})
+                opener = gzip.open if har_path.suffix == '.gz' else open
+                with opener(har_path, 'rb') as f:
+                    self.log = _stream_log(f)
             self.version = self.log.get('version', '')
             self.creator = self.log.get('creator', {})
             self.browser = self.log.get('browser', {})
             self.pages = self.log.get('pages', [])
             self.entries = self.log.get('entries', [])
+            self._scan_cache = None
             
             print(f"Loaded HAR file: {har_path.name}")
             print(f"  Version: {self.version}")
@@ -98,15 +164,19 @@ class HARAnalyzer:
         filtered_entries = []
         for entry in self.entries:
             response = entry.get('response', {})
-            headers = response.get('headers', [])
-            
-            # Check content-type header
-            for header in headers:
-                if header.get('name', '').lower() == 'content-type':
-                    if content_type in header.get('value', ''):
-                        filtered_entries.append(entry)
-                    break
-        
+
+            # HAR records the exact content type in response.content,
+            # one dict lookup; fall back to scanning the header list
+            # only when the capture left mimeType empty
+            mime = response.get('content', {}).get('mimeType', '')
+            if not mime:
+                for header in response.get('headers', []):
+                    if header.get('name', '').lower() == 'content-type':
+                        mime = header.get('value', '')
+                        break
+            if content_type in mime:
+                filtered_entries.append(entry)
+
         return filtered_entries
     
     def get_api_requests(self) -> List[Dict]:
@@ -125,20 +195,21 @@ class HARAnalyzer:
         Returns:
             List of image request entries
         """
-        image_types = ['image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/svg+xml']
         filtered_entries = []
-        
+
         for entry in self.entries:
             response = entry.get('response', {})
-            headers = response.get('headers', [])
-            
-            for header in headers:
-                if header.get('name', '').lower() == 'content-type':
-                    content_type = header.get('value', '')
-                    if any(img_type in content_type for img_type in image_types):
-                        filtered_entries.append(entry)
-                    break
-        
+
+            # Same single-lookup path as get_requests_by_type
+            mime = response.get('content', {}).get('mimeType', '')
+            if not mime:
+                for header in response.get('headers', []):
+                    if header.get('name', '').lower() == 'content-type':
+                        mime = header.get('value', '')
+                        break
+            if any(img_type in mime for img_type in _IMAGE_TYPES):
+                filtered_entries.append(entry)
+
         return filtered_entries
     
     def extract_urls(self, domain: str = None) -> List[str]:
@@ -159,7 +230,7 @@ class HARAnalyzer:
             if url and (not domain or domain in url):
                 urls.add(url)
         
-        return sorted(list(urls))
+        return sorted(urls)
     
     def extract_headers(self, header_name: str) -> List[str]:
         """
@@ -172,37 +243,115 @@ class HARAnalyzer:
             List of header values
         """
         values = set()
-        
+        # Lowercase the needle once instead of once per header compared
+        needle = header_name.lower()
+
         for entry in self.entries:
             request = entry.get('request', {})
             response = entry.get('response', {})
-            
+
             # Check request headers
             for header in request.get('headers', []):
-                if header.get('name', '').lower() == header_name.lower():
+                if header.get('name', '').lower() == needle:
                     values.add(header.get('value', ''))
-            
+
             # Check response headers
             for header in response.get('headers', []):
-                if header.get('name', '').lower() == header_name.lower():
+                if header.get('name', '').lower() == needle:
                     values.add(header.get('value', ''))
         
-        return sorted(list(values))
+        return sorted(values)
     
-    def get_timing_stats(self) -> Dict[str, Any]:
+    def _scan(self) -> Dict[str, Any]:
         """
-        Get timing statistics for all requests.
-        
+        Accumulate all summary data in one pass over the entries.
+
+        export_summary used to call a helper per field, each walking
+        self.entries (and every header list) independently - six full
+        traversals of the HAR. This fuses them into a single loop and
+        caches the result, so repeated calls are free until a new file
+        is loaded.
+
         Returns:
-            Dictionary with timing statistics
+            Dictionary with urls, domains, content_types, user_agents,
+            api_count, image_count and timings
         """
+        if self._scan_cache is not None:
+            return self._scan_cache
+
+        urls = set()
+        domains = set()
+        content_types = set()
+        user_agents = set()
+        api_count = 0
+        image_count = 0
         timings = []
-        
         for entry in self.entries:
+            request = entry.get('request', {})
+            response = entry.get('response', {})
+
+            url = request.get('url', '')
+            if url and url not in urls:
+                urls.add(url)
+                # Slice the host straight out of the URL; split('/')
+                # allocates four-plus substrings per URL to keep one
+                idx = url.find('://')
+                if idx >= 0:
+                    end = url.find('/', idx + 3)
+                    domains.add(url[idx + 3:end if end > 0 else None])
+
+            for header in request.get('headers', []):
+                name = header.get('name', '').lower()
+                if name == 'content-type':
+                    content_types.add(header.get('value', ''))
+                elif name == 'user-agent':
+                    user_agents.add(header.get('value', ''))
+
+            first_ct = None
+            for header in response.get('headers', []):
+                name = header.get('name', '').lower()
+                if name == 'content-type':
+                    value = header.get('value', '')
+                    content_types.add(value)
+                    if first_ct is None:
+                        first_ct = value
+                elif name == 'user-agent':
+                    user_agents.add(header.get('value', ''))
+
+            # Classify from response.content.mimeType with the first
+            # content-type header as fallback, mirroring
+            # get_requests_by_type and get_image_requests
+            mime = (response.get('content', {}).get('mimeType', '')
+                    or first_ct or '')
+            if 'application/json' in mime:
+                api_count += 1
+            elif any(t in mime for t in _IMAGE_TYPES):
+                image_count += 1
+
             timings_data = entry.get('timings', {})
             if timings_data:
                 timings.append(timings_data)
-        
+
+        self._scan_cache = {
+            'urls': urls,
+            'domains': domains,
+            'content_types': content_types,
+            'user_agents': user_agents,
+            'api_count': api_count,
+            'image_count': image_count,
+            'timings': timings
+        }
+        return self._scan_cache
+
+    def get_timing_stats(self) -> Dict[str, Any]:
+        """
+        Get timing statistics for all requests.
+
+        Returns:
+            Dictionary with timing statistics
+        """
+        timings = self._scan()['timings']
+
         if not timings:
             return {}
         
@@ -244,6 +393,7 @@ class HARAnalyzer:
             True if successful, False otherwise
         """
         try:
+            scan = self._scan()
             summary = {
                 'file_info': {
                     'version': self.version,
@@ -252,17 +402,24 @@ class HARAnalyzer:
                     'total_pages': len(self.pages),
                     'total_entries': len(self.entries)
                 },
-                'urls': self.extract_urls(),
-                'domains': list(set(url.split('/')[2] for url in self.extract_urls() if '://' in url)),
-                'content_types': self.extract_headers('content-type'),
-                'user_agents': self.extract_headers('user-agent'),
+                'urls': sorted(scan['urls']),
+                'domains': sorted(scan['domains']),
+                'content_types': sorted(scan['content_types']),
+                'user_agents': sorted(scan['user_agents']),
                 'timing_stats': self.get_timing_stats(),
-                'api_requests': len(self.get_api_requests()),
-                'image_requests': len(self.get_image_requests())
+                'api_requests': scan['api_count'],
+                'image_requests': scan['image_count']
             }
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(summary, f, indent=2, ensure_ascii=False)
+            # orjson emits UTF-8 bytes directly (the stdlib call needed
+            # ensure_ascii=False to get the same encoding) and its
+            # indented formatter still runs at native speed
+            if orjson is not None:
+                with open(output_path, 'wb') as f:
+                    f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    json.dump(summary, f, indent=2, ensure_ascii=False)
             
             print(f"Summary exported to: {output_path}")
             return True
@@ -293,7 +450,7 @@ def main():
         print(f"Image requests: {len(analyzer.get_image_requests())}")
         
         # Show domains
-        domains = list(set(url.split('/')[2] for url in analyzer.extract_urls() if '://' in url))
+        domains = sorted(analyzer._scan()['domains'])
         print(f"Domains: {', '.join(domains[:5])}{'...' if len(domains) > 5 else ''}")
         
         # Export summary if requested
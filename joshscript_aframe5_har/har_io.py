@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Shared HAR and JSON I/O helpers for the extraction scripts.
+
+These used to live as identical copies in extract_floorplan_coordinates,
+extract_floorplan_data, extract_geolocation_bounds and
+extract_map_bounds_from_har; keeping one copy here means every parser or
+threshold fix lands once.
+"""
+
+import json
+from pathlib import Path
+
+import ijson
+
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json when orjson is absent
+    orjson = None
+
+# Below this size one read_bytes + orjson parse of the whole HAR beats
+# streaming (orjson decodes UTF-8 in C in a single pass); larger files
+# keep the ijson path so peak memory stays bounded
+STREAM_THRESHOLD = 32 * 1024 * 1024
+
+def json_loads(text):
+    """Parse JSON with orjson when available (C-level, ~5-10x faster)."""
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+def json_dump(obj, path, indent=True):
+    """Write JSON via orjson's C formatter when available.
+
+    Per-floor files stay indented for humans; pass indent=False for the
+    large combined outputs, where compact formatting is the fastest path
+    and markedly smaller on disk.
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            if indent:
+                json.dump(obj, f, indent=2)
+            else:
+                json.dump(obj, f, separators=(',', ':'))
+
+def iter_har_entries(har_path):
+    """Yield the log.entries of a HAR file, picking the parser by size."""
+    har_path = Path(har_path)
+    if orjson is not None and har_path.stat().st_size < STREAM_THRESHOLD:
+        yield from orjson.loads(har_path.read_bytes()).get('log', {}).get('entries', [])
+        return
+    # use_float keeps numeric fields as plain floats; ijson's default
+    # Decimals are not JSON-serializable by json_dump
+    with open(har_path, 'rb') as f:
+        yield from ijson.items(f, 'log.entries.item', use_float=True)
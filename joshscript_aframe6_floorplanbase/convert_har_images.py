@@ -4,9 +4,104 @@ Convert base64 floor plan images from HAR extraction to actual image files.
 """
 
 import base64
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import json
 
+# Whitespace stripped from base64 input before decoding
+_B64_WS = b' \t\r\n'
+
+# Read size for the streaming base64 decode
+_CHUNK_SIZE = 65536
+
+# First four bytes -> extension, one hash lookup instead of a chain of
+# startswith checks; JPEG's marker is only three bytes, so its common
+# fourth bytes (APP0/APP1/DQT/Adobe) are enumerated here and the rarer
+# ones caught by the prefix fallback below
+_MAGIC = {
+    b'\x89PNG': 'png',
+    b'\xff\xd8\xff\xe0': 'jpg',
+    b'\xff\xd8\xff\xe1': 'jpg',
+    b'\xff\xd8\xff\xdb': 'jpg',
+    b'\xff\xd8\xff\xee': 'jpg',
+    b'GIF8': 'gif',
+}
+
+def _detect_format(image_data):
+    """Detect the image format from the first decoded bytes."""
+    ext = _MAGIC.get(bytes(image_data[:4]))
+    if ext:
+        return ext
+    if image_data[:4] == b'RIFF' and image_data[8:12] == b'WEBP':
+        return 'webp'
+    if image_data[:3] == b'\xff\xd8\xff':
+        return 'jpg'
+    return 'bin'
+
+def _convert_image(image_file, dest_dir):
+    """Decode one base64 image file and write it to dest_dir.
+
+    The decode is streamed in chunks: each read is decoded (in
+    multiples of four base64 characters) and written straight to the
+    output file, so peak memory stays at one chunk instead of the full
+    base64 text plus the full decoded image. The format is detected
+    from the first decoded chunk before the output file is opened.
+    """
+    floor_name = image_file.stem.replace('_image', '')
+    print(f"\nProcessing: {floor_name}")
+    print(f"  Base64 data length: {image_file.stat().st_size} characters")
+
+    decoded_size = 0
+    ext = None
+    out = None
+    output_file = None
+    try:
+        buf = bytearray()
+        with open(image_file, 'rb') as src:
+            while chunk := src.read(_CHUNK_SIZE):
+                buf.extend(chunk.translate(None, _B64_WS))
+                # Decode whole quads only; any trailing partial quad is
+                # carried over into the next read
+                n = len(buf) // 4 * 4
+                if not n:
+                    continue
+                image_data = base64.b64decode(bytes(buf[:n]))
+                del buf[:n]
+                if out is None:
+                    ext = _detect_format(image_data)
+                    if ext == 'bin':
+                        print(f"  Warning: Unknown image format, saving as .bin")
+                    output_file = dest_dir / f'{floor_name}.{ext}'
+                    out = open(output_file, 'wb')
+                out.write(image_data)
+                decoded_size += len(image_data)
+        if out is None:
+            if buf:
+                print(f"  [ERROR] Base64 data too short to decode")
+            else:
+                print(f"  [ERROR] Empty base64 file")
+            return
+        if buf:
+            image_data = base64.b64decode(bytes(buf))
+            out.write(image_data)
+            decoded_size += len(image_data)
+
+        print(f"  Decoded image size: {decoded_size} bytes ({decoded_size/1024:.1f} KB)")
+        print(f"  [OK] Saved to: {output_file}")
+        print(f"  Format: {ext.upper()}")
+
+    except Exception as e:
+        print(f"  [ERROR] Error decoding image: {e}")
+        # Don't leave a truncated image behind; the old all-at-once
+        # decode wrote nothing on failure
+        if out is not None:
+            out.close()
+            out = None
+            output_file.unlink(missing_ok=True)
+    finally:
+        if out is not None:
+            out.close()
+
 def convert_base64_to_image():
     """Convert base64 image data from HAR extraction to image files."""
     
@@ -27,45 +122,13 @@ def convert_base64_to_image():
     
     print(f"Found {len(image_files)} base64 image files")
     
-    for image_file in image_files:
-        floor_name = image_file.stem.replace('_image', '')
-        print(f"\nProcessing: {floor_name}")
-        
-        # Read base64 data
-        with open(image_file, 'r', encoding='utf-8') as f:
-            base64_data = f.read().strip()
-        
-        print(f"  Base64 data length: {len(base64_data)} characters")
-        
-        # Decode base64
-        try:
-            image_data = base64.b64decode(base64_data)
-            print(f"  Decoded image size: {len(image_data)} bytes ({len(image_data)/1024:.1f} KB)")
-            
-            # Detect image format from magic bytes
-            if image_data.startswith(b'\x89PNG'):
-                ext = 'png'
-            elif image_data.startswith(b'\xff\xd8\xff'):
-                ext = 'jpg'
-            elif image_data.startswith(b'GIF'):
-                ext = 'gif'
-            elif image_data.startswith(b'RIFF') and b'WEBP' in image_data[:20]:
-                ext = 'webp'
-            else:
-                ext = 'bin'
-                print(f"  Warning: Unknown image format, saving as .bin")
-            
-            # Save image
-            output_file = dest_dir / f'{floor_name}.{ext}'
-            with open(output_file, 'wb') as f:
-                f.write(image_data)
-            
-            print(f"  [OK] Saved to: {output_file}")
-            print(f"  Format: {ext.upper()}")
-            
-        except Exception as e:
-            print(f"  [ERROR] Error decoding image: {e}")
-    
+    # Each conversion is read -> decode -> write with no shared state,
+    # so run the files on a thread pool and let the blocking I/O overlap
+    with ThreadPoolExecutor() as executor:
+        for _ in executor.map(lambda f: _convert_image(f, dest_dir),
+                              image_files):
+            pass
+
     # Create a JSON file with image metadata
     metadata = {
         'images': []
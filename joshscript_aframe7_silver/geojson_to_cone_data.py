@@ -20,10 +20,23 @@ Coordinate System Flow:
 
 import json
 import math
+import re
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple
 
+import numpy as np
+
+try:
+    import ijson
+except ImportError:  # fall back to whole-file parsing when ijson is absent
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json when orjson is absent
+    orjson = None
+
 
 # Project Base Point Configuration
 PROJECT_BASE_POINT = {
@@ -33,6 +46,11 @@ PROJECT_BASE_POINT = {
     'angle_to_true_north': 92.04  # degrees
 }
 
+# Matches the "3D: (-4.99, 1.69, 1.46)" strings the floor plan viewer
+# writes into coords3D; one compiled scan replaces a split/strip chain
+_COORDS3D_RE = re.compile(
+    r'3D:\s*\(\s*([-+\d.eE]+)\s*,\s*([-+\d.eE]+)\s*,\s*([-+\d.eE]+)\s*\)')
+
 
 class CoordinateTransformer:
     """Handles coordinate transformation from Mt Eden to DXF local space"""
@@ -45,7 +63,15 @@ class CoordinateTransformer:
         
         # Convert rotation angle to radians
         self.rotation_rad = math.radians(self.rotation_angle)
-        
+
+        # Inverse-rotation terms, computed once: the scalar path uses
+        # the cached cos/sin, the batched path the 2x2 matrix
+        self._cos_theta = math.cos(-self.rotation_rad)
+        self._sin_theta = math.sin(-self.rotation_rad)
+        self.R2 = np.array([[self._cos_theta, -self._sin_theta],
+                            [self._sin_theta, self._cos_theta]])
+
+
     def mt_eden_to_dxf(self, easting: float, northing: float, height: float = 0.0) -> Tuple[float, float, float]:
         """
         Convert Mt Eden 2000 coordinates to local DXF coordinates
@@ -69,17 +95,38 @@ class CoordinateTransformer:
         # Use height directly (already oriented from COLMAP)
         delta_z = height
         
-        # Step 2: Rotate by negative angle (inverse rotation)
-        # Standard rotation matrix for counterclockwise rotation
-        cos_theta = math.cos(-self.rotation_rad)
-        sin_theta = math.sin(-self.rotation_rad)
-        
-        x = delta_e * cos_theta - delta_n * sin_theta
-        y = delta_e * sin_theta + delta_n * cos_theta
+        # Step 2: Rotate by negative angle (inverse rotation) using the
+        # cos/sin cached at construction
+        x = delta_e * self._cos_theta - delta_n * self._sin_theta
+        y = delta_e * self._sin_theta + delta_n * self._cos_theta
         z = delta_z  # Keep Z as relative to base elevation
         
         return (x, y, z)
-    
+
+    def mt_eden_to_dxf_batch(self, eastings: np.ndarray, northings: np.ndarray,
+                             heights: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convert coordinate arrays from Mt Eden 2000 to local DXF space
+
+        Same translate-then-rotate math as mt_eden_to_dxf, applied to
+        whole coordinate columns with one 2x2 matmul instead of a
+        Python-level call (and two libm calls) per camera.
+
+        Args:
+            eastings: 1D array of Mt Eden Easting coordinates (meters)
+            northings: 1D array of Mt Eden Northing coordinates (meters)
+            heights: 1D array of elevations above base (meters)
+
+        Returns:
+            Tuple of (x, y, z) arrays in DXF local space
+        """
+        delta = np.stack([
+            np.asarray(eastings, dtype=np.float64) - self.base_e,
+            np.asarray(northings, dtype=np.float64) - self.base_n
+        ])
+        xy = self.R2 @ delta
+        return xy[0], xy[1], np.asarray(heights, dtype=np.float64)
+
     def calculate_direction_vectors(self, positions: List[Tuple[float, float, float]]) -> List[Dict[str, Dict[str, float]]]:
         """
         Calculate forward and up direction vectors for each camera position
@@ -94,82 +141,84 @@ class CoordinateTransformer:
         Returns:
             List of direction dictionaries with 'forward' and 'up' vectors
         """
-        directions = []
-        
-        for i, (x, y, z) in enumerate(positions):
-            # Calculate forward vector (direction to next camera)
-            if i < len(positions) - 1:
-                next_x, next_y, next_z = positions[i + 1]
-                dx = next_x - x
-                dy = next_y - y
-                dz = next_z - z
-            elif i > 0:
-                # For last camera, use direction from previous
-                prev_x, prev_y, prev_z = positions[i - 1]
-                dx = x - prev_x
-                dy = y - prev_y
-                dz = z - prev_z
-            else:
-                # Single camera, use default forward direction
-                dx, dy, dz = 1.0, 0.0, 0.0
-            
-            # Normalize forward vector
-            forward_length = math.sqrt(dx*dx + dy*dy + dz*dz)
-            if forward_length > 0:
-                forward_x = dx / forward_length
-                forward_y = dy / forward_length
-                forward_z = dz / forward_length
-            else:
-                forward_x, forward_y, forward_z = 1.0, 0.0, 0.0
-            
-            # Calculate up vector (perpendicular to forward, roughly vertical)
-            # Simple approach: use world up (0, 0, 1) and adjust
-            up_x = 0.0
-            up_y = 0.0
-            up_z = 1.0
-            
-            # Make up vector orthogonal to forward (Gram-Schmidt)
-            dot = forward_x * up_x + forward_y * up_y + forward_z * up_z
-            up_x = up_x - dot * forward_x
-            up_y = up_y - dot * forward_y
-            up_z = up_z - dot * forward_z
-            
-            # Normalize up vector
-            up_length = math.sqrt(up_x*up_x + up_y*up_y + up_z*up_z)
-            if up_length > 0:
-                up_x = up_x / up_length
-                up_y = up_y / up_length
-                up_z = up_z / up_length
-            else:
-                up_x, up_y, up_z = 0.0, 0.0, 1.0
-            
-            directions.append({
-                'forward': {'x': forward_x, 'y': forward_y, 'z': forward_z},
-                'up': {'x': up_x, 'y': up_y, 'z': up_z}
-            })
-        
-        return directions
+        positions_arr = np.asarray(positions, dtype=np.float64)
+        count = len(positions_arr)
+        if count == 0:
+            return []
 
+        # Forward deltas: direction to the next camera, with the last
+        # row reusing the previous delta and a lone camera facing +X.
+        # Everything below runs on whole (N,3) columns; the old scalar
+        # loop paid for two sqrts and a handful of branches per camera.
+        deltas = np.empty_like(positions_arr)
+        if count > 1:
+            deltas[:-1] = positions_arr[1:] - positions_arr[:-1]
+            deltas[-1] = deltas[-2]
+        else:
+            deltas[0] = (1.0, 0.0, 0.0)
 
-def load_geojson(filepath: Path) -> Dict:
-    """Load GeoJSON file"""
-    with open(filepath, 'r') as f:
-        return json.load(f)
+        lengths = np.linalg.norm(deltas, axis=1, keepdims=True)
+        zero_forward = lengths[:, 0] == 0
+        lengths[zero_forward] = 1.0
+        forward = deltas / lengths
+        forward[zero_forward] = (1.0, 0.0, 0.0)
+
+        # Gram-Schmidt world up against forward; the dot product of
+        # (0, 0, 1) with each forward row is just its z component
+        up = np.array([0.0, 0.0, 1.0]) - forward[:, 2:3] * forward
+        up_lengths = np.linalg.norm(up, axis=1, keepdims=True)
+        zero_up = up_lengths[:, 0] == 0
+        up_lengths[zero_up] = 1.0
+        up /= up_lengths
+        up[zero_up] = (0.0, 0.0, 1.0)
+
+        # Build the output dicts in one zip at the very end so the hot
+        # math stays in ndarrays
+        return [
+            {
+                'forward': {'x': fx, 'y': fy, 'z': fz},
+                'up': {'x': ux, 'y': uy, 'z': uz}
+            }
+            for (fx, fy, fz), (ux, uy, uz) in zip(forward.tolist(), up.tolist())
+        ]
 
 
-def extract_camera_data(geojson: Dict) -> List[Dict]:
+def iter_features(filepath: Path):
+    """Yield GeoJSON features one at a time.
+
+    With ijson the FeatureCollection is streamed, so only one feature's
+    dicts are resident at a time instead of the whole export; without
+    it the file is parsed in one shot (orjson when available) and the
+    feature list iterated.
     """
-    Extract camera positions and metadata from GeoJSON
-    
-    Returns list of camera dictionaries with:
-    - easting, northing, height
-    - frame number
-    - image path
-    - other metadata
+    if ijson is not None:
+        # use_float keeps coordinates as plain floats; the default
+        # Decimal values are not JSON-serializable downstream
+        with open(filepath, 'rb') as f:
+            yield from ijson.items(f, 'features.item', use_float=True)
+        return
+    raw = Path(filepath).read_bytes()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    yield from data.get('features', [])
+
+
+def extract_camera_data(features) -> Tuple[Dict[str, np.ndarray], List[Dict]]:
     """
-    cameras = []
-    
-    for feature in geojson.get('features', []):
+    Extract camera positions and metadata from an iterable of GeoJSON
+    features
+
+    Returns (nums, meta): nums holds the numeric columns as parallel
+    ndarrays {'easting', 'northing', 'height'}, so the transform and
+    the height reductions run on contiguous arrays instead of scanning
+    a dict per camera; meta carries the string metadata and WGS84
+    coordinates in a list of small dicts aligned by index.
+    """
+    eastings = []
+    northings = []
+    heights = []
+    meta = []
+
+    for feature in features:
         props = feature.get('properties', {})
         coords = feature.get('geometry', {}).get('coordinates', [])
         
@@ -179,97 +228,105 @@ def extract_camera_data(geojson: Dict) -> List[Dict]:
             northing = props.get('northing')
             
             if easting is not None and northing is not None:
-                # Extract oriented height from coords3D string
+                # Extract oriented height (Z) from the coords3D string,
+                # falling back to the height property when it is absent
+                # or malformed
                 coords3d_str = props.get('coords3D', '')
-                oriented_height = 0.0
-                if coords3d_str and '3D:' in coords3d_str:
-                    try:
-                        # Extract coordinates from "3D: (-4.99, 1.69, 1.46)" format
-                        coords_part = coords3d_str.split('3D:')[1].strip()
-                        coords_part = coords_part.strip('()')
-                        coords_list = [float(x.strip()) for x in coords_part.split(',')]
-                        if len(coords_list) >= 3:
-                            oriented_height = coords_list[2]  # Z coordinate
-                    except:
-                        oriented_height = props.get('height', 0.0)  # Fallback to height property
-                else:
-                    oriented_height = props.get('height', 0.0)  # Fallback to height property
+                oriented_height = props.get('height', 0.0)
+                if coords3d_str:
+                    match = _COORDS3D_RE.search(coords3d_str)
+                    if match:
+                        try:
+                            oriented_height = float(match.group(3))
+                        except ValueError:
+                            pass
                 
-                camera = {
-                    'easting': easting,
-                    'northing': northing,
-                    'height': oriented_height,  # Use oriented height from coords3D
+                eastings.append(easting)
+                northings.append(northing)
+                heights.append(oriented_height)  # Oriented height from coords3D
+                meta.append({
                     'longitude': coords[0],
                     'latitude': coords[1],
                     'frame': props.get('frame', '0000'),
                     'frame_id': props.get('frameId', '0'),
                     'image': props.get('image', ''),
                     'camera': props.get('camera', ''),
-                'coords_3d': props.get('coords3D', ''),
-                'group': props.get('group', '')
-            }
-            cameras.append(camera)
-    
-    return cameras
+                    'coords_3d': props.get('coords3D', ''),
+                    'group': props.get('group', '')
+                })
+
+    nums = {
+        'easting': np.asarray(eastings, dtype=np.float64),
+        'northing': np.asarray(northings, dtype=np.float64),
+        'height': np.asarray(heights, dtype=np.float64)
+    }
+    return nums, meta
 
 
-def convert_geojson_to_cone_data(geojson_path: Path, output_path: Path, 
-                                  panorama_dir: str = 'panoramas') -> Dict:
+def convert_geojson_to_cone_data(geojson_path: Path, output_path: Path,
+                                  panorama_dir: str = 'panoramas',
+                                  verbose: bool = False) -> Dict:
     """
     Main conversion function
-    
+
     Args:
         geojson_path: Path to input GeoJSON file
         output_path: Path to output cone_data.json file
         panorama_dir: Directory name for panorama images
-        
+        verbose: Print every transformed position; off by default since
+            a print per camera dominates wallclock on large exports
+
     Returns:
         The generated cone_data dictionary
     """
     print(f"Loading GeoJSON from: {geojson_path}")
-    geojson = load_geojson(geojson_path)
-    
     print(f"Extracting camera data...")
-    cameras = extract_camera_data(geojson)
-    print(f"Found {len(cameras)} camera positions")
-    
+    nums, meta = extract_camera_data(iter_features(geojson_path))
+    count = len(meta)
+    print(f"Found {count} camera positions")
+
     # Calculate dynamic base elevation from camera heights
-    heights = [cam['height'] for cam in cameras if 'height' in cam]
-    if heights:
-        min_height = min(heights)
-        max_height = max(heights)
+    heights_arr = nums['height']
+    if count:
+        min_height = float(heights_arr.min())
+        max_height = float(heights_arr.max())
         print(f"Camera height range: {min_height:.2f}m to {max_height:.2f}m")
         print(f"Using minimum height as base elevation: {min_height:.2f}m")
-        
+
         # Update base point with dynamic elevation
         dynamic_base_point = PROJECT_BASE_POINT.copy()
         dynamic_base_point['elevation'] = min_height
     else:
         dynamic_base_point = PROJECT_BASE_POINT
-    
+
     # Initialize transformer
     transformer = CoordinateTransformer(dynamic_base_point)
-    
-    # Transform coordinates
+
+    # Transform the coordinate columns in one batched call
     print("Transforming coordinates from Mt Eden to DXF space...")
-    dxf_positions = []
-    for cam in cameras:
-        x, y, z = transformer.mt_eden_to_dxf(
-            cam['easting'], 
-            cam['northing'], 
-            cam['height']
-        )
-        dxf_positions.append((x, y, z))
-        print(f"  Frame {cam['frame']}: Mt Eden ({cam['easting']:.2f}, {cam['northing']:.2f}, {cam['height']:.2f}) "
-              f"→ DXF ({x:.2f}, {y:.2f}, {z:.2f})")
+    eastings = nums['easting']
+    northings = nums['northing']
+    xs, ys, zs = transformer.mt_eden_to_dxf_batch(eastings, northings, heights_arr)
+    dxf_positions = list(zip(xs.tolist(), ys.tolist(), zs.tolist()))
+    # Plain-float views of the columns for printing and JSON assembly
+    e_list = eastings.tolist()
+    n_list = northings.tolist()
+    h_list = heights_arr.tolist()
+    if verbose:
+        for cam, e, n, h, (x, y, z) in zip(meta, e_list, n_list, h_list,
+                                           dxf_positions):
+            print(f"  Frame {cam['frame']}: Mt Eden ({e:.2f}, {n:.2f}, {h:.2f}) "
+                  f"→ DXF ({x:.2f}, {y:.2f}, {z:.2f})")
+    else:
+        print(f"  Transformed {count} camera positions")
     
     # Calculate direction vectors
     print("Calculating camera direction vectors...")
     directions = transformer.calculate_direction_vectors(dxf_positions)
     
-    # Build cone data structure
-    cones = []
-    for i, (cam, pos, direction) in enumerate(zip(cameras, dxf_positions, directions)):
+    # Build cone data structure into a presized list
+    cones = [None] * count
+    for i, (cam, pos, direction) in enumerate(zip(meta, dxf_positions, directions)):
         # Extract frame number for image path
         frame_num = cam['frame']
         if isinstance(frame_num, str):
@@ -288,9 +345,9 @@ def convert_geojson_to_cone_data(geojson_path: Path, output_path: Path,
             'image_path': f"{panorama_dir}/frame_{cam['frame']}.jpg",
             'metadata': {
                 'mt_eden_coords': {
-                    'easting': cam['easting'],
-                    'northing': cam['northing'],
-                    'height': cam['height']
+                    'easting': e_list[i],
+                    'northing': n_list[i],
+                    'height': h_list[i]
                 },
                 'wgs84_coords': {
                     'longitude': cam['longitude'],
@@ -301,7 +358,7 @@ def convert_geojson_to_cone_data(geojson_path: Path, output_path: Path,
                 'group': cam['group']
             }
         }
-        cones.append(cone)
+        cones[i] = cone
     
     # Create final cone_data structure
     cone_data = {
@@ -317,8 +374,12 @@ def convert_geojson_to_cone_data(geojson_path: Path, output_path: Path,
     
     # Write output
     print(f"\nWriting cone_data.json to: {output_path}")
-    with open(output_path, 'w') as f:
-        json.dump(cone_data, f, indent=2)
+    if orjson is not None:
+        Path(output_path).write_bytes(
+            orjson.dumps(cone_data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, 'w') as f:
+            json.dump(cone_data, f, indent=2)
     
     print(f"\n✓ Conversion complete!")
     print(f"  Generated {len(cones)} cone entries")
@@ -32,11 +32,12 @@ recon_path = Path('reconstruction_single/sparse/0')
 print(f"Loading reconstruction from {recon_path}...")
 recon = pycolmap.Reconstruction(str(recon_path))
 
-# Collect points
-pts = []
-for pid, p in recon.points3D.items():
-    pts.append(np.array(p.xyz, dtype=float))
-pts = np.vstack(pts)
+# Collect points in one contiguous allocation: fromiter with a known
+# count writes straight into the final (N,3) buffer, instead of N small
+# per-point arrays plus a vstack copy of the lot
+vals = recon.points3D.values()
+pts = np.fromiter((c for p in vals for c in p.xyz),
+                  dtype=np.float64, count=3 * len(vals)).reshape(-1, 3)
 N = pts.shape[0]
 print(f"Point count: {N}")
 
@@ -45,15 +46,23 @@ centroid = pts.mean(axis=0)
 minpt = pts.min(axis=0)
 maxpt = pts.max(axis=0)
 
-# Transform
-pts_t = (R_scaled @ pts.T).T  # new = 1.5 * R @ orig
-centroid_t = pts_t.mean(axis=0)
+# Transform: right-multiplying by R.T is the same map as
+# (R @ pts.T).T but keeps both operands and the result row-major
+# contiguous, so the matmul and the reductions below stream the
+# memory in order instead of through transposed views
+pts_t = pts @ R_scaled.T  # new = 1.5 * R @ orig
+# The mean commutes with a linear map, so the transformed centroid
+# comes straight from the original one - no extra pass over the array
+centroid_t = R_scaled @ centroid
 minpt_t = pts_t.min(axis=0)
 maxpt_t = pts_t.max(axis=0)
 
-# Displacements
+# Displacements: einsum sums the squares in one fused sweep and the
+# sqrt is taken in place, skipping the abs/square temporaries that
+# np.linalg.norm would materialize for N x 3 rows
 disp = pts_t - pts
-disp_mag = np.linalg.norm(disp, axis=1)
+disp_sq = np.einsum('ij,ij->i', disp, disp)
+disp_mag = np.sqrt(disp_sq, out=disp_sq)
 
 # Print summary
 np.set_printoptions(precision=6, suppress=True)
@@ -3,7 +3,8 @@ Apply mask template to all extracted frames.
 This script copies the mask_template.png to each frame folder with the correct naming.
 """
 
-import shutil
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Configuration
@@ -32,35 +33,42 @@ def apply_masks():
     print()
     
     total_masks = 0
-    
-    for folder_name in frame_folders:
-        folder_path = CAMERA_DIR / folder_name
-        
-        if not folder_path.exists():
-            print(f"⚠ Skipping {folder_name} - folder not found")
-            continue
-        
-        # Find all JPG frames in this folder
-        jpg_files = sorted(folder_path.glob("*.jpg"))
-        
-        if not jpg_files:
-            print(f"⚠ No JPG files found in {folder_name}")
-            continue
-        
-        print(f"📁 Processing: {folder_name}")
-        print(f"   Found {len(jpg_files)} frames")
-        
-        # Copy mask for each frame
-        for jpg_file in jpg_files:
+
+    # Read the template once; every destination receives the same
+    # bytes, so each copy is a single open+write instead of copy2
+    # re-opening, re-reading and re-statting the source per frame
+    mask_blob = MASK_TEMPLATE.read_bytes()
+
+    # The copies are pure syscall latency (open/write/close per
+    # destination), so fan them out over threads; each frame's mask is
+    # independent and the GIL is released during the I/O
+    with ThreadPoolExecutor(max_workers=(os.cpu_count() or 4) * 2) as executor:
+        for folder_name in frame_folders:
+            folder_path = CAMERA_DIR / folder_name
+
+            if not folder_path.exists():
+                print(f"⚠ Skipping {folder_name} - folder not found")
+                continue
+
+            # Find all JPG frames in this folder
+            jpg_files = sorted(folder_path.glob("*.jpg"))
+
+            if not jpg_files:
+                print(f"⚠ No JPG files found in {folder_name}")
+                continue
+
+            print(f"📁 Processing: {folder_name}")
+            print(f"   Found {len(jpg_files)} frames")
+
             # Mask filename must be: frame_name.jpg.png
-            mask_file = folder_path / f"{jpg_file.name}.png"
-            
-            # Copy the template mask
-            shutil.copy2(MASK_TEMPLATE, mask_file)
-            total_masks += 1
-        
-        print(f"   ✓ Created {len(jpg_files)} mask files")
-        print()
+            mask_files = [folder_path / f"{jpg_file.name}.png"
+                          for jpg_file in jpg_files]
+            for _ in executor.map(
+                    lambda dst: dst.write_bytes(mask_blob), mask_files):
+                total_masks += 1
+
+            print(f"   ✓ Created {len(jpg_files)} mask files")
+            print()
     
     print("=" * 60)
     print(f"✅ SUCCESS! Created {total_masks} mask files")
@@ -104,15 +104,19 @@ def compute_gravity_alignment_rotation(gravity_direction, target_up=np.array([0,
     print(f"  Rotation axis: ({axis[0]:.6f}, {axis[1]:.6f}, {axis[2]:.6f})")
     print(f"  Rotation angle: {angle_degrees:.2f} degrees")
     
-    # Rodrigues' rotation formula
+    # Rodrigues' rotation formula in the fused form
+    # R = cos*I + sin*K + (1-cos)*k k^T, which replaces the K @ K matmul
+    # with a rank-1 outer product
+    c = np.cos(angle)
+    s = np.sin(angle)
     K = np.array([
         [0, -axis[2], axis[1]],
         [axis[2], 0, -axis[0]],
         [-axis[1], axis[0], 0]
     ])
-    
-    R = np.eye(3) + np.sin(angle) * K + (1 - np.cos(angle)) * K @ K
-    
+
+    R = c * np.eye(3) + s * K + (1 - c) * np.outer(axis, axis)
+
     return R
 
 
@@ -127,32 +131,32 @@ def extract_camera_positions(reconstruction, camera_index=1):
     Returns:
         camera_positions: Nx3 array of camera positions
     """
-    camera_positions = []
-    
-    # Group images by frame_id
+    # First pass: collect the qualifying image per frame
+    camera_tag = f"camera{camera_index}"
     frame_cameras = {}
     for image_id, image in reconstruction.images.items():
         if hasattr(image, 'frame_id') and image.frame_id is not None:
             if image.frame_id not in frame_cameras:
                 frame_cameras[image.frame_id] = []
             frame_cameras[image.frame_id].append(image)
-    
-    # For each frame, find the specific camera
+
+    selected = []
     for frame_id in sorted(frame_cameras.keys()):
-        images_in_frame = frame_cameras[frame_id]
-        
-        for image in images_in_frame:
+        for image in frame_cameras[frame_id]:
             # Check if this is the camera we want
-            if f"camera{camera_index}" in image.name.lower():
-                # Get camera position
-                cam_from_world = image.cam_from_world()
-                rot_mat = cam_from_world.rotation.matrix()
-                cam_pos = -rot_mat.T @ cam_from_world.translation
-                
-                camera_positions.append(cam_pos)
+            if camera_tag in image.name.lower():
+                selected.append(image)
                 break
-    
-    return np.array(camera_positions)
+
+    if not selected:
+        return np.empty((0, 3))
+
+    # Second pass: stack all poses and compute every camera center (-R^T t)
+    # with one batched einsum instead of a per-image 3x3 matvec
+    poses = [image.cam_from_world() for image in selected]
+    rot_mats = np.stack([pose.rotation.matrix() for pose in poses])
+    translations = np.stack([pose.translation for pose in poses])
+    return -np.einsum('nji,nj->ni', rot_mats, translations)
 
 
 def rotation_matrix_to_basis_vectors(R):
@@ -186,13 +190,9 @@ def create_top_down_svg(camera_positions, R, origin_m, scale, output_file):
     """
     print("\nGenerating top-down SVG view of camera positions...")
     
-    # Transform camera positions same way as DXF export
-    transformed_positions = []
-    for cam_pos in camera_positions:
-        transformed_pos = origin_m + scale * (R @ cam_pos)
-        transformed_positions.append(transformed_pos)
-    
-    transformed_positions = np.array(transformed_positions)
+    # Transform camera positions same way as DXF export (single batched
+    # matmul instead of a per-camera R @ x loop)
+    transformed_positions = origin_m + scale * (camera_positions @ R.T)
     
     # Extract X and Y coordinates (top-down view)
     x_coords = transformed_positions[:, 0]
@@ -202,13 +202,14 @@ def create_top_down_svg(camera_positions, R, origin_m, scale, output_file):
     avg_x = np.mean(x_coords)
     avg_y = np.mean(y_coords)
     
-    # Calculate robust bounds (10th to 90th percentile + padding)
-    x_sorted = np.sort(x_coords)
-    y_sorted = np.sort(y_coords)
-    p10_idx = int(len(x_sorted) * 0.1)
-    p90_idx = int(len(x_sorted) * 0.9)
-    x_p10, x_p90 = x_sorted[p10_idx], x_sorted[p90_idx]
-    y_p10, y_p90 = y_sorted[p10_idx], y_sorted[p90_idx]
+    # Calculate robust bounds (10th to 90th percentile + padding); only two
+    # order statistics are needed, so partition instead of a full sort
+    p10_idx = int(len(x_coords) * 0.1)
+    p90_idx = int(len(x_coords) * 0.9)
+    x_part = np.partition(x_coords, (p10_idx, p90_idx))
+    y_part = np.partition(y_coords, (p10_idx, p90_idx))
+    x_p10, x_p90 = x_part[p10_idx], x_part[p90_idx]
+    y_p10, y_p90 = y_part[p10_idx], y_part[p90_idx]
     
     padding_factor = 1.3  # 30% padding
     width = (x_p90 - x_p10) * padding_factor